@@ -2,13 +2,22 @@ from __future__ import annotations
 
 import argparse
 import csv
+import functools
+import hashlib
+import json
 import os
-import xml.etree.ElementTree as ET
+import re
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timezone
+from email.utils import format_datetime
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
-from .episodes_requests import EpisodesRequestsTable, EpisodeRequest
+from lxml import etree as ET
+
+from .episodes_requests import EpisodeRequest, TaskStatus, iter_requests
+from .table_cache import cached_parse
 
 NS_ATOM = "http://www.w3.org/2005/Atom"
 NS_ITUNES = "http://www.itunes.com/dtds/podcast-1.0.dtd"
@@ -16,15 +25,68 @@ NS_GOOGLEPLAY = "http://www.google.com/schemas/play-podcasts/1.0"
 NS_PODCAST = "https://podcastindex.org/namespace/1.0"
 NS_CONTENT = "http://purl.org/rss/1.0/modules/content/"
 
+_PUBLISHABLE_STATUSES = frozenset({TaskStatus.DONE, "DOWNLOADED"})
+
+# Clark-notation names, built once rather than per element.
+ATOM_LINK = f"{{{NS_ATOM}}}link"
+ITUNES_AUTHOR = f"{{{NS_ITUNES}}}author"
+ITUNES_BLOCK = f"{{{NS_ITUNES}}}block"
+ITUNES_CATEGORY = f"{{{NS_ITUNES}}}category"
+ITUNES_COMPLETE = f"{{{NS_ITUNES}}}complete"
+ITUNES_EMAIL = f"{{{NS_ITUNES}}}email"
+ITUNES_EXPLICIT = f"{{{NS_ITUNES}}}explicit"
+ITUNES_IMAGE = f"{{{NS_ITUNES}}}image"
+ITUNES_KEYWORDS = f"{{{NS_ITUNES}}}keywords"
+ITUNES_NAME = f"{{{NS_ITUNES}}}name"
+ITUNES_NEW_FEED_URL = f"{{{NS_ITUNES}}}new-feed-url"
+ITUNES_OWNER = f"{{{NS_ITUNES}}}owner"
+ITUNES_SUBTITLE = f"{{{NS_ITUNES}}}subtitle"
+ITUNES_SUMMARY = f"{{{NS_ITUNES}}}summary"
+ITUNES_TYPE = f"{{{NS_ITUNES}}}type"
+GOOGLEPLAY_AUTHOR = f"{{{NS_GOOGLEPLAY}}}author"
+GOOGLEPLAY_BLOCK = f"{{{NS_GOOGLEPLAY}}}block"
+GOOGLEPLAY_CATEGORY = f"{{{NS_GOOGLEPLAY}}}category"
+GOOGLEPLAY_DESCRIPTION = f"{{{NS_GOOGLEPLAY}}}description"
+GOOGLEPLAY_EXPLICIT = f"{{{NS_GOOGLEPLAY}}}explicit"
+GOOGLEPLAY_IMAGE = f"{{{NS_GOOGLEPLAY}}}image"
+PODCAST_FUNDING = f"{{{NS_PODCAST}}}funding"
+PODCAST_GUID = f"{{{NS_PODCAST}}}guid"
+PODCAST_LOCATION = f"{{{NS_PODCAST}}}location"
+PODCAST_LOCKED = f"{{{NS_PODCAST}}}locked"
+PODCAST_TRAILER = f"{{{NS_PODCAST}}}trailer"
+CONTENT_ENCODED = f"{{{NS_CONTENT}}}encoded"
+
+# Per-item constants, built once instead of on every <item>.
+_GUID_ATTRIB = {"isPermaLink": "false"}
+
+# Cheap shape check ahead of datetime.fromisoformat; rejects blanks and junk
+# without raising. Date-only and space-separated values are still accepted.
+_ISO_RE = re.compile(
+    r"^\d{4}-\d{2}-\d{2}(?:[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?)?(?:Z|[+-]\d{2}:?\d{2})?$"
+)
+
+# Compact encoder reused for fingerprints instead of one per json.dumps call.
+_JSON_ENCODER = json.JSONEncoder(separators=(",", ":"), sort_keys=True)
+
+# Declared once on <rss>; lxml then reuses these prefixes for every namespaced child.
+NSMAP = {
+    "atom": NS_ATOM,
+    "itunes": NS_ITUNES,
+    "googleplay": NS_GOOGLEPLAY,
+    "podcast": NS_PODCAST,
+    "content": NS_CONTENT,
+}
+
 
 def _utc_now_rfc822() -> str:
     # Example: "Mon, 09 Feb 2026 02:10:00 +0000"
-    return datetime.now(timezone.utc).strftime("%a, %d %b %Y %H:%M:%S %z")
+    return format_datetime(datetime.now(timezone.utc))
 
 
+@functools.lru_cache(maxsize=8192)
 def _iso_to_rfc822(s: str) -> Optional[str]:
     s = (s or "").strip()
-    if not s:
+    if not _ISO_RE.match(s):
         return None
     try:
         # Accept: 2026-02-08T19:00:00Z or with offset
@@ -34,12 +96,16 @@ def _iso_to_rfc822(s: str) -> Optional[str]:
             dt = datetime.fromisoformat(s)
         if dt.tzinfo is None:
             dt = dt.replace(tzinfo=timezone.utc)
-        return dt.astimezone(timezone.utc).strftime("%a, %d %b %Y %H:%M:%S %z")
+        return format_datetime(dt.astimezone(timezone.utc))
     except Exception:
         return None
 
 
 def _read_podcasts_table(path: str) -> Dict[str, Dict[str, str]]:
+    return cached_parse("podcasts_rss", path, _parse_podcasts_table)
+
+
+def _parse_podcasts_table(path: str) -> Dict[str, Dict[str, str]]:
     out: Dict[str, Dict[str, str]] = {}
     with open(path, newline="", encoding="utf-8") as f:
         r = csv.DictReader(f)
@@ -53,21 +119,14 @@ def _read_podcasts_table(path: str) -> Dict[str, Dict[str, str]]:
     return out
 
 
-def _t(parent: ET.Element, tag: str, text: str) -> None:
-    if not text:
-        return
-    el = ET.SubElement(parent, tag)
-    el.text = text
-
-
-def _t_ns(parent: ET.Element, ns: str, tag: str, text: str, attrib: Optional[dict] = None) -> None:
+def _t(parent: ET.Element, tag: str, text: str, attrib: Optional[dict] = None) -> None:
     if not text:
         return
-    el = ET.SubElement(parent, f"{{{ns}}}{tag}", attrib=attrib or {})
+    el = ET.SubElement(parent, tag, attrib=attrib or {})
     el.text = text
 
 
-def _set_channel_metadata(channel: ET.Element, pcfg: Dict[str, str]) -> None:
+def _set_channel_metadata(channel: ET.Element, pcfg: Dict[str, str], now_rfc822: str) -> None:
     # Core RSS 2.0
     _t(channel, "title", pcfg.get("show_title", ""))
     _t(channel, "link", pcfg.get("show_website_url", ""))
@@ -76,14 +135,14 @@ def _set_channel_metadata(channel: ET.Element, pcfg: Dict[str, str]) -> None:
     _t(channel, "copyright", pcfg.get("copyright", ""))
 
     lbd = pcfg.get("last_build_date", "")
-    _t(channel, "lastBuildDate", _iso_to_rfc822(lbd) or _utc_now_rfc822())
+    _t(channel, "lastBuildDate", _iso_to_rfc822(lbd) or now_rfc822)
 
     # Atom self link (helps aggregators)
     self_url = pcfg.get("feed_self_url", "")
     if self_url:
         ET.SubElement(
             channel,
-            f"{{{NS_ATOM}}}link",
+            ATOM_LINK,
             attrib={"href": self_url, "rel": "self", "type": "application/rss+xml"},
         )
 
@@ -96,75 +155,93 @@ def _set_channel_metadata(channel: ET.Element, pcfg: Dict[str, str]) -> None:
         _t(img, "link", pcfg.get("show_website_url", ""))
 
     # iTunes show-level tags
-    _t_ns(channel, NS_ITUNES, "author", pcfg.get("author_name", ""))
+    _t(channel, ITUNES_AUTHOR, pcfg.get("author_name", ""))
     # Many platforms map summary/subtitle from description if not provided separately.
-    _t_ns(channel, NS_ITUNES, "summary", pcfg.get("show_description", ""))
-    _t_ns(channel, NS_ITUNES, "subtitle", pcfg.get("show_title", ""))
+    _t(channel, ITUNES_SUMMARY, pcfg.get("show_description", ""))
+    _t(channel, ITUNES_SUBTITLE, pcfg.get("show_title", ""))
 
     owner_name = pcfg.get("owner_name", "")
     owner_email = pcfg.get("owner_email", "")
     if owner_name or owner_email:
-        owner = ET.SubElement(channel, f"{{{NS_ITUNES}}}owner")
-        _t(owner, f"{{{NS_ITUNES}}}name", owner_name)
-        _t(owner, f"{{{NS_ITUNES}}}email", owner_email)
+        owner = ET.SubElement(channel, ITUNES_OWNER)
+        _t(owner, ITUNES_NAME, owner_name)
+        _t(owner, ITUNES_EMAIL, owner_email)
 
     if art:
-        ET.SubElement(channel, f"{{{NS_ITUNES}}}image", attrib={"href": art})
+        ET.SubElement(channel, ITUNES_IMAGE, attrib={"href": art})
 
-    _t_ns(channel, NS_ITUNES, "explicit", pcfg.get("explicit", ""))
-    _t_ns(channel, NS_ITUNES, "type", pcfg.get("podcast_type", ""))
-    _t_ns(channel, NS_ITUNES, "complete", pcfg.get("is_complete", ""))
-    _t_ns(channel, NS_ITUNES, "block", pcfg.get("is_blocked", ""))
-    _t_ns(channel, NS_ITUNES, "new-feed-url", pcfg.get("new_feed_url", ""))
-    _t_ns(channel, NS_ITUNES, "keywords", pcfg.get("keywords", ""))
+    _t(channel, ITUNES_EXPLICIT, pcfg.get("explicit", ""))
+    _t(channel, ITUNES_TYPE, pcfg.get("podcast_type", ""))
+    _t(channel, ITUNES_COMPLETE, pcfg.get("is_complete", ""))
+    _t(channel, ITUNES_BLOCK, pcfg.get("is_blocked", ""))
+    _t(channel, ITUNES_NEW_FEED_URL, pcfg.get("new_feed_url", ""))
+    _t(channel, ITUNES_KEYWORDS, pcfg.get("keywords", ""))
 
     for k in ("category_1", "category_2", "category_3"):
         cat = pcfg.get(k, "")
         if cat:
-            ET.SubElement(channel, f"{{{NS_ITUNES}}}category", attrib={"text": cat})
+            ET.SubElement(channel, ITUNES_CATEGORY, attrib={"text": cat})
 
     # Google Podcasts (a.k.a. Google Play podcasts schema)
-    _t_ns(channel, NS_GOOGLEPLAY, "author", pcfg.get("author_name", ""))
-    _t_ns(channel, NS_GOOGLEPLAY, "description", pcfg.get("show_description", ""))
+    _t(channel, GOOGLEPLAY_AUTHOR, pcfg.get("author_name", ""))
+    _t(channel, GOOGLEPLAY_DESCRIPTION, pcfg.get("show_description", ""))
     if art:
-        _t_ns(channel, NS_GOOGLEPLAY, "image", art)
-    _t_ns(channel, NS_GOOGLEPLAY, "explicit", pcfg.get("explicit", ""))
-    _t_ns(channel, NS_GOOGLEPLAY, "block", pcfg.get("is_blocked", ""))
+        _t(channel, GOOGLEPLAY_IMAGE, art)
+    _t(channel, GOOGLEPLAY_EXPLICIT, pcfg.get("explicit", ""))
+    _t(channel, GOOGLEPLAY_BLOCK, pcfg.get("is_blocked", ""))
     for k in ("category_1", "category_2", "category_3"):
         cat = pcfg.get(k, "")
         if cat:
-            _t_ns(channel, NS_GOOGLEPLAY, "category", cat)
+            _t(channel, GOOGLEPLAY_CATEGORY, cat)
 
     # Podcast Namespace (PodcastIndex)
-    _t_ns(channel, NS_PODCAST, "guid", pcfg.get("global_guid", ""))
+    _t(channel, PODCAST_GUID, pcfg.get("global_guid", ""))
 
     locked = pcfg.get("locked", "").lower()
     if locked in ("yes", "true", "1"):
         owner = pcfg.get("owner_email", "")
-        ET.SubElement(channel, f"{{{NS_PODCAST}}}locked", attrib={"owner": owner}).text = "yes"
+        ET.SubElement(channel, PODCAST_LOCKED, attrib={"owner": owner}).text = "yes"
 
     for idx in ("1", "2"):
         url = pcfg.get(f"funding_url_{idx}", "")
         text = pcfg.get(f"funding_text_{idx}", "")
         if url:
-            _t_ns(channel, NS_PODCAST, "funding", text or url, attrib={"url": url})
+            _t(channel, PODCAST_FUNDING, text or url, attrib={"url": url})
 
     loc = pcfg.get("location", "")
     if loc:
-        _t_ns(channel, NS_PODCAST, "location", loc)
+        _t(channel, PODCAST_LOCATION, loc)
 
     trailer = pcfg.get("trailer_url", "")
     if trailer:
-        ET.SubElement(channel, f"{{{NS_PODCAST}}}trailer", attrib={"url": trailer})
-
-
-def _add_item(channel: ET.Element, r: EpisodeRequest, pcfg: Dict[str, str]) -> None:
+        ET.SubElement(channel, PODCAST_TRAILER, attrib={"url": trailer})
+
+
+def _item_show_tags(pcfg: Dict[str, str]) -> List[Tuple[str, str]]:
+    # Show-level values repeated on every item; resolved once per feed.
+    author = pcfg.get("author_name", "")
+    explicit = pcfg.get("explicit", "")
+    tags = [
+        (ITUNES_AUTHOR, author),
+        (ITUNES_EXPLICIT, explicit),
+        (GOOGLEPLAY_AUTHOR, author),
+        (GOOGLEPLAY_EXPLICIT, explicit),
+    ]
+    return [(tag, text) for tag, text in tags if text]
+
+
+def _add_item(
+    channel: ET.Element,
+    r: EpisodeRequest,
+    show_tags: List[Tuple[str, str]],
+    now_rfc822: str,
+) -> None:
     item = ET.SubElement(channel, "item")
     _t(item, "title", r.title)
     if r.task_id:
-        ET.SubElement(item, "guid", attrib={"isPermaLink": "false"}).text = r.task_id
+        ET.SubElement(item, "guid", attrib=_GUID_ATTRIB).text = r.task_id
 
-    pub = _iso_to_rfc822(r.downloaded_at_utc) or _iso_to_rfc822(r.requested_at_utc) or _utc_now_rfc822()
+    pub = _iso_to_rfc822(r.downloaded_at_utc) or _iso_to_rfc822(r.requested_at_utc) or now_rfc822
     _t(item, "pubDate", pub)
 
     # Enclosure
@@ -176,22 +253,87 @@ def _add_item(channel: ET.Element, r: EpisodeRequest, pcfg: Dict[str, str]) -> N
         )
 
     # Descriptions: plain + content:encoded for maximum compatibility.
-    _t(item, "description", r.description)
     if r.description:
-        _t_ns(item, NS_CONTENT, "encoded", r.description)
+        ET.SubElement(item, "description").text = r.description
+        ET.SubElement(item, CONTENT_ENCODED).text = r.description
 
     # Platform-specific episode tags
-    _t_ns(item, NS_ITUNES, "author", pcfg.get("author_name", ""))
-    _t_ns(item, NS_ITUNES, "explicit", pcfg.get("explicit", ""))
-
-    _t_ns(item, NS_GOOGLEPLAY, "author", pcfg.get("author_name", ""))
-    _t_ns(item, NS_GOOGLEPLAY, "explicit", pcfg.get("explicit", ""))
+    for tag, text in show_tags:
+        _t(item, tag, text)
 
 
 def _write_xml(path: Path, root: ET.Element) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
-    tree = ET.ElementTree(root)
-    tree.write(path, encoding="utf-8", xml_declaration=True)
+    # Serialize straight to UTF-8 bytes and write them without a text-IO layer.
+    buf = memoryview(ET.tostring(root, encoding="utf-8", xml_declaration=True))
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        while buf:
+            buf = buf[os.write(fd, buf):]
+    finally:
+        os.close(fd)
+
+
+def _item_sort_key(r: EpisodeRequest) -> Tuple[str, str]:
+    # ISO-8601 UTC timestamps sort lexicographically, so no date parsing is needed.
+    return (r.downloaded_at_utc or r.requested_at_utc or "", r.task_id)
+
+
+def _feed_fingerprint(items: List[EpisodeRequest], pcfg: Dict[str, str]) -> str:
+    # Covers every input that ends up in the XML; items must already be sorted.
+    h = hashlib.blake2b(digest_size=16)
+    rows = [
+        (r.task_id, r.title, r.description, r.audio_url, r.downloaded_at_utc, r.requested_at_utc)
+        for r in items
+    ]
+    h.update(_JSON_ENCODER.encode(rows).encode("utf-8"))
+    h.update(_JSON_ENCODER.encode(pcfg).encode("utf-8"))
+    return h.hexdigest()
+
+
+def _read_fingerprint(path: Path) -> str:
+    try:
+        return path.read_text(encoding="utf-8").strip()
+    except OSError:
+        return ""
+
+
+def _build_one(job: Tuple[str, List[EpisodeRequest], Optional[Dict[str, str]], str]) -> None:
+    # Top-level so ProcessPoolExecutor can pickle it.
+    pid, items, pcfg, now_rfc822 = job
+    if not pcfg:
+        print(f"[build_rss][warn] missing podcasts.csv row for podcast_id={pid}")
+        return
+
+    rss_path = (pcfg.get("audio_rss_path") or "").strip()
+    if not rss_path:
+        # Default if missing.
+        rss_path = f"feed/audio_{pid}.xml"
+
+    # Determinism: order by downloaded_at then task_id. The list is owned by
+    # this job, so sort it in place.
+    items.sort(key=_item_sort_key)
+
+    # Skip the rebuild when neither the items nor the show config changed.
+    xml_path = Path(rss_path)
+    hash_path = Path(rss_path + ".hash")
+    fp = _feed_fingerprint(items, pcfg)
+    if xml_path.exists() and _read_fingerprint(hash_path) == fp:
+        print(f"[build_rss] skip unchanged {rss_path} podcast_id={pid}")
+        return
+
+    rss = ET.Element("rss", attrib={"version": "2.0"}, nsmap=NSMAP)
+    channel = ET.SubElement(rss, "channel")
+    _set_channel_metadata(channel, pcfg, now_rfc822)
+
+    show_tags = _item_show_tags(pcfg)
+    for r in items:
+        _add_item(channel, r, show_tags, now_rfc822)
+
+    _write_xml(xml_path, rss)
+    # Written after the feed so a failed build is never recorded as current.
+    hash_path.write_text(fp + "\n", encoding="utf-8")
+    print(f"[build_rss] wrote {rss_path} items={len(items)} podcast_id={pid}")
 
 
 def main() -> int:
@@ -200,63 +342,25 @@ def main() -> int:
     ap.add_argument("--podcasts", default=os.environ.get("PODCASTS_TABLE", "data/video-data/podcasts.csv"))
     args = ap.parse_args()
 
-    # Register namespaces so ElementTree emits stable prefixes.
-    ET.register_namespace("atom", NS_ATOM)
-    ET.register_namespace("itunes", NS_ITUNES)
-    ET.register_namespace("googleplay", NS_GOOGLEPLAY)
-    ET.register_namespace("podcast", NS_PODCAST)
-    ET.register_namespace("content", NS_CONTENT)
-
     podcasts = _read_podcasts_table(args.podcasts)
-    table = EpisodesRequestsTable(args.requests)
-    reqs = table.load()
-
-    by_podcast: Dict[str, List[EpisodeRequest]] = {}
-    for r in reqs:
-        if r.status != "DOWNLOADED":
-            continue
-        if not r.podcast_id:
-            continue
-        by_podcast.setdefault(r.podcast_id, []).append(r)
-
-    for pid, items in by_podcast.items():
-        pcfg = podcasts.get(pid)
-        if not pcfg:
-            print(f"[build_rss][warn] missing podcasts.csv row for podcast_id={pid}")
-            continue
-
-        rss_path = (pcfg.get("audio_rss_path") or "").strip()
-        if not rss_path:
-            # Default if missing.
-            rss_path = f"feed/audio_{pid}.xml"
-
-        rss = ET.Element(
-            "rss",
-            attrib={
-                "version": "2.0",
-                f"xmlns:atom": NS_ATOM,
-                f"xmlns:itunes": NS_ITUNES,
-                f"xmlns:googleplay": NS_GOOGLEPLAY,
-                f"xmlns:podcast": NS_PODCAST,
-                f"xmlns:content": NS_CONTENT,
-            },
-        )
-        channel = ET.SubElement(rss, "channel")
-        _set_channel_metadata(channel, pcfg)
-
-        # Determinism: order by downloaded_at then task_id.
-        items_sorted = sorted(
-            items,
-            key=lambda x: (
-                x.downloaded_at_utc or x.requested_at_utc or "",
-                x.task_id,
-            ),
-        )
-        for r in items_sorted:
-            _add_item(channel, r, pcfg)
-
-        _write_xml(Path(rss_path), rss)
-        print(f"[build_rss] wrote {rss_path} items={len(items_sorted)} podcast_id={pid}")
+    # One timestamp per run keeps fallback dates consistent across feeds.
+    now_rfc822 = _utc_now_rfc822()
+
+    # mark_downloaded() records DONE; DOWNLOADED is accepted for older rows.
+    by_podcast: Dict[str, List[EpisodeRequest]] = defaultdict(list)
+    for r in iter_requests(args.requests, _PUBLISHABLE_STATUSES):
+        if r.podcast_id:
+            by_podcast[r.podcast_id].append(r)
+
+    # Feeds are independent; build them in parallel when there is more than one.
+    jobs = [(pid, items, podcasts.get(pid), now_rfc822) for pid, items in by_podcast.items()]
+    if len(jobs) <= 1:
+        for job in jobs:
+            _build_one(job)
+    else:
+        workers = min(len(jobs), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            list(ex.map(_build_one, jobs, chunksize=max(1, len(jobs) // (4 * workers))))
 
     return 0
 
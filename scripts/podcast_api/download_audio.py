@@ -2,23 +2,67 @@ from __future__ import annotations
 
 import argparse
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
+from typing import List
 
 from .episodes_requests import (
+    EpisodeRequest,
     EpisodesRequestsTable,
+    JournalWriter,
     find_next_for_download,
+    index_by_status,
     mark_downloaded,
     mark_failed_download,
 )
 from .podcasts_table import load_podcasts_table
 from .podcast_api_client import PodcastApiClient
-from .github_release import get_or_create_release, upload_asset
+from .github_release import ReleaseInfo, get_or_create_release, upload_asset, upload_asset_stream
 
 
 def _ensure_dir(p: Path) -> None:
     p.mkdir(parents=True, exist_ok=True)
 
 
+def _checkpoint(journal: JournalWriter, r: EpisodeRequest) -> None:
+    # Fields written by mark_downloaded / mark_failed_download.
+    journal.record(
+        r.task_id,
+        {
+            "status": r.status,
+            "audio_release_tag": r.audio_release_tag,
+            "audio_asset_name": r.audio_asset_name,
+            "audio_url": r.audio_url,
+            "downloaded_at_utc": r.downloaded_at_utc,
+            "last_error": r.last_error,
+        },
+    )
+
+
+def _process_one(
+    r: EpisodeRequest,
+    client: PodcastApiClient,
+    release: ReleaseInfo,
+    out_dir: Path,
+    keep_local: bool,
+) -> str:
+    # Runs on a worker thread: network only, no table mutation.
+    asset_name = f"{r.task_id}.mp3"
+    if not keep_local:
+        # Pipe the audio from the Podcast API straight into the release upload.
+        streamed = client.stream_operation_audio(r.operation_name)
+        if streamed is not None:
+            size, chunks = streamed
+            return upload_asset_stream(release, chunks=chunks, size=size, asset_name=asset_name)
+
+    dest = out_dir / asset_name
+    # PodcastApiClient uses dst_path.
+    client.download_operation_audio(operation_name=r.operation_name, dst_path=str(dest))
+
+    # Upload to a GitHub release tag for durable storage.
+    return upload_asset(release, file_path=str(dest), asset_name=asset_name)
+
+
 def main() -> int:
     ap = argparse.ArgumentParser(description="Download Podcast API audio for REQUESTED tasks")
     ap.add_argument("--table", default=os.environ.get("EPISODES_REQUESTS", "data/video-data/episodes_requests.csv"))
@@ -32,6 +76,15 @@ def main() -> int:
         default=os.environ.get("AUDIO_RELEASE_TAG", "audio-archive"),
     )
     ap.add_argument("--max", type=int, default=int(os.environ.get("MAX_TASKS", "10")))
+    ap.add_argument(
+        "--keep_local",
+        "--keep-local",
+        dest="keep_local",
+        action="store_true",
+        default=os.environ.get("AUDIO_KEEP_LOCAL", "").strip().lower() in ("1", "true", "yes"),
+        help="Write each MP3 under --out_dir before uploading instead of streaming it",
+    )
+    ap.add_argument("--workers", type=int, default=int(os.environ.get("DOWNLOAD_WORKERS", "4")))
     args = ap.parse_args()
 
     podcasts = load_podcasts_table(args.podcasts)
@@ -52,34 +105,55 @@ def main() -> int:
     client = PodcastApiClient(project_id=gcp_project, access_token=token)
     table = EpisodesRequestsTable(args.table)
     reqs = table.load()
+    by_status = index_by_status(reqs)
 
     out_dir = Path(args.out_dir)
     _ensure_dir(out_dir)
 
-    processed = 0
-    while processed < args.max:
-        r = find_next_for_download(reqs)
+    batch: List[EpisodeRequest] = []
+    while len(batch) < args.max:
+        r = find_next_for_download(reqs, by_status)
         if not r:
             break
-        if not r.operation_name:
-            mark_failed_download(r, "missing operation_name")
-            processed += 1
-            continue
-
-        try:
-            dest = out_dir / f"{r.task_id}.mp3"
-            # PodcastApiClient uses dst_path.
-            client.download_operation_audio(operation_name=r.operation_name, dst_path=str(dest))
-
-            # Upload to a GitHub release tag for durable storage.
-            release = get_or_create_release(tag=args.release_tag)
-            asset_name = f"{r.task_id}.mp3"
-            download_url = upload_asset(release=release, file_path=str(dest), asset_name=asset_name)
-            mark_downloaded(r, tag=args.release_tag, asset_name=asset_name, audio_url=download_url)
-        except Exception as e:
-            mark_failed_download(r, str(e))
-        processed += 1
+        batch.append(r)
+
+    journal = JournalWriter(args.table)
+    try:
+        runnable: List[EpisodeRequest] = []
+        for r in batch:
+            if r.operation_name:
+                runnable.append(r)
+            else:
+                mark_failed_download(r, "missing operation_name")
+                _checkpoint(journal, r)
+
+        release = None
+        if runnable:
+            # Resolved once; workers only upload into it.
+            try:
+                release = get_or_create_release(tag=args.release_tag)
+            except Exception as e:
+                for r in runnable:
+                    mark_failed_download(r, str(e))
+                    _checkpoint(journal, r)
+
+        if release is not None:
+            workers = max(1, min(args.workers, len(runnable)))
+            with ThreadPoolExecutor(max_workers=workers) as ex:
+                futures = {ex.submit(_process_one, r, client, release, out_dir, args.keep_local): r for r in runnable}
+                # Table updates and checkpoints stay on the main thread.
+                for fut in as_completed(futures):
+                    r = futures[fut]
+                    try:
+                        download_url = fut.result()
+                        mark_downloaded(r, tag=args.release_tag, asset_name=f"{r.task_id}.mp3", audio_url=download_url)
+                    except Exception as e:
+                        mark_failed_download(r, str(e))
+                    _checkpoint(journal, r)
+    finally:
+        journal.close()
 
+    processed = len(batch)
     table.save(reqs)
     print(f"[download_audio] processed={processed}")
     return 0
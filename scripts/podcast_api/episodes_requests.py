@@ -1,28 +1,57 @@
 from __future__ import annotations
 
 import csv
+import json
+import operator
 import os
+import sys
+from collections import defaultdict, deque
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Dict, List, Optional
+from typing import Deque, Dict, Iterable, Iterator, List, Optional
+
+from .table_cache import cached_parse
 
 
 DEFAULT_TABLE_PATH = os.path.join("data", "video-data", "episodes_requests.csv")
 
+# Column order of episodes_requests.csv; matches the EpisodeRequest field order.
+_FIELDNAMES = (
+    "task_id",
+    "podcast_id",
+    "source_urls",
+    "custom_prompt",
+    "title",
+    "description",
+    "status",
+    "operation_name",
+    "requested_at_utc",
+    "downloaded_at_utc",
+    "audio_release_tag",
+    "audio_asset_name",
+    "audio_url",
+    "last_error",
+)
+_STATUS_POS = _FIELDNAMES.index("status")
+_PODCAST_ID_POS = _FIELDNAMES.index("podcast_id")
+_ROW_GETTER = operator.attrgetter(*_FIELDNAMES)
+
 
 def _utc_now_iso() -> str:
     return datetime.now(timezone.utc).replace(microsecond=0).isoformat()
 
 
 class TaskStatus:
-    PENDING_REQUEST = "PENDING_REQUEST"
-    REQUESTED = "REQUESTED"
-    REQUEST_FAILED = "REQUEST_FAILED"
-    DONE = "DONE"
-    DOWNLOAD_FAILED = "DOWNLOAD_FAILED"
+    # Interned so loaded statuses share these objects and equality hits the
+    # identity fast path.
+    PENDING_REQUEST = sys.intern("PENDING_REQUEST")
+    REQUESTED = sys.intern("REQUESTED")
+    REQUEST_FAILED = sys.intern("REQUEST_FAILED")
+    DONE = sys.intern("DONE")
+    DOWNLOAD_FAILED = sys.intern("DOWNLOAD_FAILED")
 
 
-@dataclass
+@dataclass(slots=True)
 class EpisodeRequest:
     task_id: str
     podcast_id: str
@@ -46,12 +75,13 @@ class EpisodeRequest:
 
         return EpisodeRequest(
             task_id=g("task_id"),
-            podcast_id=g("podcast_id"),
+            podcast_id=sys.intern(g("podcast_id")),
             source_urls=g("source_urls"),
             custom_prompt=g("custom_prompt"),
             title=g("title"),
             description=g("description"),
-            status=g("status"),
+            # Normalized once here so status checks are plain equality.
+            status=sys.intern(g("status").upper()),
             operation_name=g("operation_name"),
             requested_at_utc=g("requested_at_utc"),
             downloaded_at_utc=g("downloaded_at_utc"),
@@ -62,106 +92,255 @@ class EpisodeRequest:
         )
 
     def to_row(self) -> Dict[str, str]:
-        return {
-            "task_id": self.task_id,
-            "podcast_id": self.podcast_id,
-            "source_urls": self.source_urls,
-            "custom_prompt": self.custom_prompt,
-            "title": self.title,
-            "description": self.description,
-            "status": self.status,
-            "operation_name": self.operation_name,
-            "requested_at_utc": self.requested_at_utc,
-            "downloaded_at_utc": self.downloaded_at_utc,
-            "audio_release_tag": self.audio_release_tag,
-            "audio_asset_name": self.audio_asset_name,
-            "audio_url": self.audio_url,
-            "last_error": self.last_error,
-        }
+        # Deprecated: kept for external callers. save_requests() writes
+        # _ROW_GETTER tuples and no longer builds a dict per row.
+        return dict(zip(_FIELDNAMES, _ROW_GETTER(self)))
+
+
+def iter_requests(
+    path: str = DEFAULT_TABLE_PATH,
+    status_filter: Optional[Iterable[str]] = None,
+) -> Iterator[EpisodeRequest]:
+    # Streaming reader for read-only consumers. Journaled updates not yet
+    # folded into the CSV are applied, so checkpointed results are visible.
+    # Callers that save the table back must use load_requests() so no rows
+    # are dropped.
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"episodes_requests table not found: {path}")
+    return _iter_rows(path, status_filter, _read_journal(path))
 
 
-def load_requests(path: str = DEFAULT_TABLE_PATH) -> List[EpisodeRequest]:
+def _iter_rows(
+    path: str,
+    status_filter: Optional[Iterable[str]],
+    patches: Optional[Dict[str, Dict[int, str]]],
+) -> Iterator[EpisodeRequest]:
     if not os.path.exists(path):
         raise FileNotFoundError(f"episodes_requests table not found: {path}")
+    wanted = frozenset(status_filter) if status_filter is not None else None
 
     with open(path, "r", encoding="utf-8", newline="") as f:
-        reader = csv.DictReader(f)
-        rows: List[EpisodeRequest] = []
+        reader = csv.reader(f)
+        header = next(reader, None) or []
+        idx = {name: i for i, name in enumerate(header)}
+        # Resolve column positions once; missing columns read as "".
+        cols = [idx.get(name, -1) for name in _FIELDNAMES]
+        yielded = 0
         data_rows = 0
         skipped_comment = 0
         for row in reader:
+            n = len(row)
+            vals = [row[i].strip() if 0 <= i < n else "" for i in cols]
             # Allow comment rows (starting with '#')
-            tid = (row.get("task_id") or "").strip()
+            tid = vals[0]
             if not tid:
                 continue
             data_rows += 1
             if tid.startswith("#"):
                 skipped_comment += 1
                 continue
-            rows.append(EpisodeRequest.from_row(row))
+            patch = patches.get(tid) if patches else None
+            if patch:
+                for i, v in patch.items():
+                    vals[i] = v
+            status = sys.intern(vals[_STATUS_POS].upper())
+            if wanted is not None and status not in wanted:
+                continue
+            vals[_STATUS_POS] = status
+            vals[_PODCAST_ID_POS] = sys.intern(vals[_PODCAST_ID_POS])
+            yielded += 1
+            yield EpisodeRequest(*vals)
 
-        if data_rows > 0 and not rows and skipped_comment == data_rows:
+        if data_rows > 0 and not yielded and skipped_comment == data_rows:
             print(
                 "[episodes_requests][warn] All rows are commented out (task_id starts with '#'). "
                 "Add at least one real task_id without '#'."
             )
 
-        return rows
+
+def load_requests(path: str = DEFAULT_TABLE_PATH) -> List[EpisodeRequest]:
+    # The cache holds the CSV alone; the journal is replayed on every load.
+    rows = cached_parse("episodes_requests", path, lambda p: list(_iter_rows(p, None, None)))
+    # Unpickled strings are not interned; restore sharing with TaskStatus.
+    for r in rows:
+        r.status = sys.intern(r.status)
+        r.podcast_id = sys.intern(r.podcast_id)
+    _replay_journal(rows, _read_journal(path))
+    return rows
+
+
+def journal_path(path: str) -> str:
+    return path + ".journal"
+
+
+# One encoder for every journal line rather than one per json.dumps call.
+_JOURNAL_ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+
+def _table_stamp(path: str) -> Optional[List[int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+class JournalWriter:
+    # Append-only log of per-task field updates made since the last full save.
+    # Each record is one JSON line, so a checkpoint costs O(1) instead of
+    # rewriting the whole CSV; load_requests() and iter_requests() replay it,
+    # save_requests() folds it into the CSV and removes it. The first line
+    # records the (mtime_ns, size) of the CSV the patches were made against.
+    def __init__(self, path: str = DEFAULT_TABLE_PATH):
+        self.table_path = path
+        self.path = journal_path(path)
+        self._f = None
+
+    def record(self, task_id: str, patch: Dict[str, str]) -> None:
+        if self._f is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._f = open(self.path, "a", encoding="utf-8")
+            if self._f.tell() == 0:
+                base = _JOURNAL_ENCODER.encode({"base": _table_stamp(self.table_path)})
+                self._f.write(base + "\n")
+        line = _JOURNAL_ENCODER.encode({"task_id": task_id, "patch": patch})
+        self._f.write(line + "\n")
+        self._f.flush()
+
+    def close(self) -> None:
+        if self._f is not None:
+            self._f.close()
+            self._f = None
+
+
+def _read_journal(table_path: str) -> Dict[str, Dict[int, str]]:
+    # Merged patches per task_id, keyed by column position. A journal whose
+    # base stamp no longer matches the CSV (pulled or edited since the
+    # crash) would overwrite newer rows, so it is set aside instead.
+    path = journal_path(table_path)
+    try:
+        f = open(path, "r", encoding="utf-8")
+    except FileNotFoundError:
+        return {}
+    patches: Dict[str, Dict[int, str]] = {}
+    with f:
+        try:
+            base = json.loads(f.readline()).get("base")
+        except (ValueError, AttributeError):
+            base = None
+        stamp = _table_stamp(table_path)
+        if base is None or base != stamp:
+            stale = path + ".stale"
+            print(
+                f"[episodes_requests][warn] journal base {base} does not match {table_path} {stamp}; "
+                f"ignoring it (moved to {stale})"
+            )
+            f.close()
+            os.replace(path, stale)
+            return {}
+        for line in f:
+            try:
+                rec = json.loads(line)
+            except ValueError:
+                # A crash mid-write can leave a truncated last line.
+                continue
+            tid = rec.get("task_id") or ""
+            for k, v in (rec.get("patch") or {}).items():
+                if k in _FIELDNAMES:
+                    v = str(v)
+                    patches.setdefault(tid, {})[_FIELDNAMES.index(k)] = v.upper() if k == "status" else v
+    return patches
+
+
+def _replay_journal(rows: List[EpisodeRequest], patches: Dict[str, Dict[int, str]]) -> None:
+    if not patches:
+        return
+    for r in rows:
+        patch = patches.get(r.task_id)
+        if not patch:
+            continue
+        for i, v in patch.items():
+            setattr(r, _FIELDNAMES[i], sys.intern(v) if i == _STATUS_POS else v)
 
 
 def save_requests(reqs: List[EpisodeRequest], path: str = DEFAULT_TABLE_PATH) -> None:
     if not reqs:
         return
 
-    fieldnames = list(reqs[0].to_row().keys())
     os.makedirs(os.path.dirname(path), exist_ok=True)
     tmp_path = path + ".tmp"
     with open(tmp_path, "w", encoding="utf-8", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        for r in reqs:
-            writer.writerow(r.to_row())
+        writer = csv.writer(f)
+        writer.writerow(_FIELDNAMES)
+        writer.writerows(_ROW_GETTER(r) for r in reqs)
     os.replace(tmp_path, path)
+    # The CSV now holds every journaled update.
+    try:
+        os.unlink(journal_path(path))
+    except FileNotFoundError:
+        pass
 
 
-def find_next_for_request(reqs: List[EpisodeRequest]) -> Optional[EpisodeRequest]:
+def index_by_status(reqs: List[EpisodeRequest]) -> Dict[str, Deque[EpisodeRequest]]:
+    # One pass over the table; callers pop candidates instead of rescanning.
+    idx: Dict[str, Deque[EpisodeRequest]] = defaultdict(deque)
+    for r in reqs:
+        idx[r.status].append(r)
+    return idx
+
+
+def _pop_next(
+    reqs: List[EpisodeRequest],
+    status: str,
+    index: Optional[Dict[str, Deque[EpisodeRequest]]],
+) -> Optional[EpisodeRequest]:
+    if index is not None:
+        q = index.get(status)
+        return q.popleft() if q else None
     for r in reqs:
-        if r.status.strip().upper() == "PENDING_REQUEST":
+        if r.status == status:
             return r
     return None
 
 
-def find_next_for_download(reqs: List[EpisodeRequest]) -> Optional[EpisodeRequest]:
-    for r in reqs:
-        if r.status.strip().upper() == "REQUESTED":
-            return r
-    return None
+def find_next_for_request(
+    reqs: List[EpisodeRequest],
+    index: Optional[Dict[str, Deque[EpisodeRequest]]] = None,
+) -> Optional[EpisodeRequest]:
+    return _pop_next(reqs, TaskStatus.PENDING_REQUEST, index)
+
+
+def find_next_for_download(
+    reqs: List[EpisodeRequest],
+    index: Optional[Dict[str, Deque[EpisodeRequest]]] = None,
+) -> Optional[EpisodeRequest]:
+    return _pop_next(reqs, TaskStatus.REQUESTED, index)
 
 
 def mark_requested(r: EpisodeRequest, operation_name: str) -> None:
     r.operation_name = operation_name
-    r.status = "REQUESTED"
+    r.status = TaskStatus.REQUESTED
     r.requested_at_utc = _utc_now_iso()
     r.last_error = ""
 
 
 def mark_failed_request(r: EpisodeRequest, err: str) -> None:
     r.last_error = err
-    r.status = "REQUEST_FAILED"
+    r.status = TaskStatus.REQUEST_FAILED
 
 
 def mark_downloaded(r: EpisodeRequest, tag: str, asset_name: str, audio_url: str) -> None:
     r.audio_release_tag = tag
     r.audio_asset_name = asset_name
     r.audio_url = audio_url
-    r.status = "DONE"
+    r.status = TaskStatus.DONE
     r.downloaded_at_utc = _utc_now_iso()
     r.last_error = ""
 
 
 def mark_failed_download(r: EpisodeRequest, err: str) -> None:
     r.last_error = err
-    r.status = "DOWNLOAD_FAILED"
+    r.status = TaskStatus.DOWNLOAD_FAILED
 
 
 class EpisodesRequestsTable:
@@ -180,7 +359,7 @@ class EpisodesRequestsTable:
         save_requests(reqs, self.path)
 
     def iter_pending_requests(self, reqs: List[EpisodeRequest]) -> List[EpisodeRequest]:
-        return [r for r in reqs if r.status.strip().upper() == TaskStatus.PENDING_REQUEST]
+        return [r for r in reqs if r.status == TaskStatus.PENDING_REQUEST]
 
     def update_task(self, reqs: List[EpisodeRequest], task_id: str, patch: Dict[str, str]) -> None:
         for r in reqs:
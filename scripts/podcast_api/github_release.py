@@ -2,14 +2,29 @@ from __future__ import annotations
 
 import json
 import os
+import threading
 from dataclasses import dataclass
-from typing import Optional
+from typing import Dict, Iterable, Iterator, Optional, Union
 
 import requests
+from requests.adapters import HTTPAdapter
+
+from .table_cache import CACHE_DIR
 
 
 GITHUB_API = "https://api.github.com"
 
+# One pooled, keep-alive session for all GitHub API and upload calls. The
+# token is added per call so importing this module does not require it.
+_SESSION = requests.Session()
+_SESSION.headers.update(
+    {
+        "Accept": "application/vnd.github+json",
+        "X-GitHub-Api-Version": "2022-11-28",
+    }
+)
+_SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+
 
 @dataclass
 class ReleaseInfo:
@@ -32,17 +47,56 @@ def _token() -> str:
 
 
 def _headers() -> dict:
-    return {
-        "Authorization": f"Bearer {_token()}",
-        "Accept": "application/vnd.github+json",
-        "X-GitHub-Api-Version": "2022-11-28",
-    }
+    # Accept and X-GitHub-Api-Version come from _SESSION.
+    return {"Authorization": f"Bearer {_token()}"}
+
+
+# "{repo}:{tag}" -> {"etag": ..., "upload_url": ...}. Lets release lookups
+# send If-None-Match; a 304 carries no body and does not count against the
+# API rate limit.
+_RELEASE_CACHE_PATH = os.path.join(CACHE_DIR, "gh_releases.json")
+_release_cache: Optional[Dict[str, Dict[str, str]]] = None
+_release_lock = threading.Lock()
+
+
+def _release_cache_get(key: str) -> Optional[Dict[str, str]]:
+    global _release_cache
+    with _release_lock:
+        if _release_cache is None:
+            try:
+                with open(_RELEASE_CACHE_PATH, "r", encoding="utf-8") as f:
+                    _release_cache = json.load(f)
+            except (OSError, ValueError):
+                _release_cache = {}
+        return _release_cache.get(key)
+
+
+def _release_cache_put(key: str, etag: str, upload_url: str) -> None:
+    with _release_lock:
+        if _release_cache is None:
+            return
+        _release_cache[key] = {"etag": etag, "upload_url": upload_url}
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            tmp_path = _RELEASE_CACHE_PATH + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(_release_cache, f)
+            os.replace(tmp_path, _RELEASE_CACHE_PATH)
+        except OSError:
+            pass
 
 
 def get_or_create_release(tag: str, name: Optional[str] = None) -> ReleaseInfo:
     repo = _repo()
     url = f"{GITHUB_API}/repos/{repo}/releases/tags/{tag}"
-    r = requests.get(url, headers=_headers(), timeout=60)
+    cache_key = f"{repo}:{tag}"
+    cached = _release_cache_get(cache_key)
+    headers = _headers()
+    if cached and cached.get("etag"):
+        headers["If-None-Match"] = cached["etag"]
+    r = _SESSION.get(url, headers=headers, timeout=60)
+    if r.status_code == 304 and cached:
+        return ReleaseInfo(tag_name=tag, upload_url=cached["upload_url"])
     if r.status_code == 404:
         create_url = f"{GITHUB_API}/repos/{repo}/releases"
         payload = {
@@ -51,7 +105,7 @@ def get_or_create_release(tag: str, name: Optional[str] = None) -> ReleaseInfo:
             "draft": False,
             "prerelease": False,
         }
-        cr = requests.post(create_url, headers=_headers(), json=payload, timeout=60)
+        cr = _SESSION.post(create_url, headers=_headers(), json=payload, timeout=60)
         if cr.status_code >= 300:
             raise RuntimeError(f"create release failed: {cr.status_code} {cr.text}")
         data = cr.json()
@@ -60,22 +114,70 @@ def get_or_create_release(tag: str, name: Optional[str] = None) -> ReleaseInfo:
     if r.status_code >= 300:
         raise RuntimeError(f"get release failed: {r.status_code} {r.text}")
     data = r.json()
+    etag = r.headers.get("ETag", "")
+    if etag:
+        _release_cache_put(cache_key, etag, data["upload_url"])
     return ReleaseInfo(tag_name=tag, upload_url=data["upload_url"])
 
 
-def upload_asset(tag: str, file_path: str, asset_name: str, content_type: str = "audio/mpeg") -> str:
-    rel = get_or_create_release(tag)
+class _SizedStream:
+    # requests only sends a Content-Length (which the asset upload endpoint
+    # requires) for iterables it can len(); a bare generator is sent chunked.
+    def __init__(self, chunks: Iterable[bytes], size: int) -> None:
+        self._chunks = chunks
+        self._size = size
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[bytes]:
+        return iter(self._chunks)
+
+
+def _resolve_release(tag_or_release: Union[str, ReleaseInfo]) -> ReleaseInfo:
+    # Callers uploading several assets resolve the release once and pass the
+    # ReleaseInfo; a bare tag still works and costs one lookup per upload.
+    if isinstance(tag_or_release, ReleaseInfo):
+        return tag_or_release
+    return get_or_create_release(tag_or_release)
+
+
+def upload_asset(
+    tag_or_release: Union[str, ReleaseInfo],
+    file_path: str,
+    asset_name: str,
+    content_type: str = "audio/mpeg",
+) -> str:
+    rel = _resolve_release(tag_or_release)
+    # Stream the open file instead of reading it into memory first.
+    size = os.path.getsize(file_path)
+    with open(file_path, "rb") as f:
+        return _post_asset(rel, asset_name, content_type, f, size)
+
+
+def upload_asset_stream(
+    tag_or_release: Union[str, ReleaseInfo],
+    chunks: Iterable[bytes],
+    size: int,
+    asset_name: str,
+    content_type: str = "audio/mpeg",
+) -> str:
+    rel = _resolve_release(tag_or_release)
+    return _post_asset(rel, asset_name, content_type, _SizedStream(chunks, size), size)
+
+
+def _post_asset(rel: ReleaseInfo, asset_name: str, content_type: str, data, size: int) -> str:
     upload_url = rel.upload_url.split("{")[0]
     url = f"{upload_url}?name={asset_name}"
-    with open(file_path, "rb") as f:
-        data = f.read()
     headers = _headers()
     headers["Content-Type"] = content_type
-    r = requests.post(url, headers=headers, data=data, timeout=600)
+    # The upload endpoint rejects chunked bodies; always send the length.
+    headers["Content-Length"] = str(size)
+    r = _SESSION.post(url, headers=headers, data=data, timeout=600)
     if r.status_code == 422 and "already_exists" in r.text:
         # Asset exists: fetch assets list and return matching browser_download_url.
-        assets_url = f"{GITHUB_API}/repos/{_repo()}/releases/tags/{tag}"
-        rr = requests.get(assets_url, headers=_headers(), timeout=60)
+        assets_url = f"{GITHUB_API}/repos/{_repo()}/releases/tags/{rel.tag_name}"
+        rr = _SESSION.get(assets_url, headers=_headers(), timeout=60)
         if rr.status_code >= 300:
             raise RuntimeError(f"asset exists but release fetch failed: {rr.status_code} {rr.text}")
         assets = rr.json().get("assets", [])
@@ -2,15 +2,25 @@ from __future__ import annotations
 
 import json
 import os
+import random
+import shutil
 import time
 from dataclasses import dataclass
-from typing import Any, Dict, Optional, Sequence
+from typing import Any, Dict, Iterator, Optional, Sequence, Tuple
 
 import requests
 
 
 DISCOVERYENGINE_BASE = "https://discoveryengine.googleapis.com/v1"
 
+# Media downloads send only the session's Authorization header; a None value
+# drops the JSON Content-Type for that request.
+_MEDIA_HEADERS = {"Content-Type": None}
+
+# Compact UTF-8 request bodies: no padding after separators and no \uXXXX
+# escapes for non-ASCII context text (the session declares charset=utf-8).
+_JSON_ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
 
 @dataclass
 class Operation:
@@ -28,6 +38,10 @@ class PodcastApiClient:
         self.project_id = project_id
         self.location = location
         self.access_token = access_token
+        # One keep-alive session per client: create, the polling loop and the
+        # audio download all reuse its pooled connections.
+        self._s = requests.Session()
+        self._s.headers.update(self._headers())
 
     def _headers(self) -> Dict[str, str]:
         return {
@@ -72,7 +86,8 @@ class PodcastApiClient:
             "description": description or "",
         }
 
-        r = requests.post(endpoint, headers=self._headers(), data=json.dumps(payload), timeout=120)
+        body = _JSON_ENCODER.encode(payload).encode("utf-8")
+        r = self._s.post(endpoint, data=body, timeout=120)
         try:
             r.raise_for_status()
         except requests.HTTPError as e:
@@ -90,7 +105,7 @@ class PodcastApiClient:
             op_url = f"{DISCOVERYENGINE_BASE}/{name}"
         else:
             op_url = f"{DISCOVERYENGINE_BASE}/{name.lstrip('/')}"
-        r = requests.get(op_url, headers=self._headers(), timeout=60)
+        r = self._s.get(op_url, timeout=60)
         r.raise_for_status()
         data = r.json()
         return Operation(
@@ -99,30 +114,75 @@ class PodcastApiClient:
             error=data.get("error"),
         )
 
-    def wait_operation_done(self, name: str, *, timeout_sec: int = 3600, poll_sec: int = 15) -> Operation:
-        start = time.time()
+    def wait_operation_done(
+        self,
+        name: str,
+        *,
+        timeout_sec: int = 3600,
+        poll_sec: float = 30.0,
+        initial_poll_sec: float = 2.0,
+    ) -> Operation:
+        # Exponential backoff: start at initial_poll_sec, double up to poll_sec,
+        # with +/-20% jitter so concurrent waiters do not poll in lockstep.
+        start = time.monotonic()
+        delay = initial_poll_sec
         while True:
             op = self.get_operation(name)
             if op.done:
                 return op
-            if time.time() - start > timeout_sec:
+            if time.monotonic() - start > timeout_sec:
                 raise TimeoutError(f"operation not done after {timeout_sec}s: {name}")
-            time.sleep(poll_sec)
+            time.sleep(delay * random.uniform(0.8, 1.2))
+            delay = min(poll_sec, delay * 2)
 
-    def download_operation_audio(self, operation_name: str, dst_path: str) -> None:
+    def _download_url(self, operation_name: str) -> str:
         # GET https://discoveryengine.googleapis.com/v1/OPERATION_NAME:download?alt=media
         if not operation_name.startswith("projects/"):
             operation_name = operation_name.lstrip("/")
-        url = f"{DISCOVERYENGINE_BASE}/{operation_name}:download?alt=media"
-        with requests.get(
+        return f"{DISCOVERYENGINE_BASE}/{operation_name}:download?alt=media"
+
+    def stream_operation_audio(
+        self, operation_name: str, *, chunk_size: int = 1024 * 1024
+    ) -> Optional[Tuple[int, Iterator[bytes]]]:
+        # Returns (size, chunks) for piping straight into an upload, or None when
+        # the response has no usable Content-Length (uploads need the size up
+        # front); callers then fall back to download_operation_audio.
+        r = self._s.get(
+            self._download_url(operation_name),
+            headers=_MEDIA_HEADERS,
+            stream=True,
+            timeout=300,
+        )
+        try:
+            r.raise_for_status()
+        except Exception:
+            r.close()
+            raise
+        size = (r.headers.get("Content-Length") or "").strip()
+        if not size.isdigit() or r.headers.get("Content-Encoding"):
+            r.close()
+            return None
+
+        def chunks() -> Iterator[bytes]:
+            with r:
+                for chunk in r.iter_content(chunk_size=chunk_size):
+                    if chunk:
+                        yield chunk
+
+        return int(size), chunks()
+
+    def download_operation_audio(self, operation_name: str, dst_path: str) -> None:
+        url = self._download_url(operation_name)
+        with self._s.get(
             url,
-            headers={"Authorization": f"Bearer {self.access_token}"},
+            headers=_MEDIA_HEADERS,
             stream=True,
             timeout=300,
         ) as r:
             r.raise_for_status()
+            # Copy the raw socket stream straight to disk; decode_content keeps
+            # transparent gzip handling that iter_content used to provide.
+            r.raw.decode_content = True
             os.makedirs(os.path.dirname(dst_path), exist_ok=True)
             with open(dst_path, "wb") as f:
-                for chunk in r.iter_content(chunk_size=1024 * 1024):
-                    if chunk:
-                        f.write(chunk)
+                shutil.copyfileobj(r.raw, f, length=1 << 20)
@@ -1,9 +1,12 @@
 from __future__ import annotations
 
 import csv
+import functools
 import os
 from dataclasses import dataclass
-from typing import Dict
+from typing import Callable, Dict, List
+
+from .table_cache import cached_parse
 
 
 DEFAULT_PODCASTS_PATH = os.path.join("data", "video-data", "podcasts.csv")
@@ -40,6 +43,11 @@ class PodcastConfig:
         def g(k: str) -> str:
             return (row.get(k) or "").strip()
 
+        return PodcastConfig._from_getter(g)
+
+    @staticmethod
+    def _from_getter(g: Callable[[str], str]) -> "PodcastConfig":
+        # g(column) returns the stripped cell, or "" when the column is absent.
         # Support two schemas:
         # - normalized podcasts.csv (show_title, show_description, ...)
         # - older schema (podcast_name, summary, description, ...)
@@ -95,14 +103,37 @@ def load_podcasts(path: str = DEFAULT_PODCASTS_PATH) -> Dict[str, PodcastConfig]
         path = DEFAULT_PODCASTS_PATH
     if not os.path.exists(path):
         raise FileNotFoundError(f"podcasts table not found: {path}")
+    # from_row falls back to $GCP_PROJECT_ID, so it is part of the cache key.
+    env_project = os.environ.get("GCP_PROJECT_ID", "").strip()
+    st = os.stat(path)
+    # The returned dict is shared between callers; treat it as read-only.
+    return _load_cached(path, st.st_mtime_ns, st.st_size, env_project)
+
+
+@functools.lru_cache(maxsize=8)
+def _load_cached(path: str, mtime_ns: int, size: int, env_project: str) -> Dict[str, PodcastConfig]:
+    # In-process memo over the on-disk cache; a changed file has a new key.
+    return cached_parse("podcasts", path, _parse_podcasts, extra=(env_project,))
+
+
+def _parse_podcasts(path: str) -> Dict[str, PodcastConfig]:
     out: Dict[str, PodcastConfig] = {}
     with open(path, "r", encoding="utf-8", newline="") as f:
-        reader = csv.DictReader(f)
+        # csv.reader + a header index avoids building a dict per row.
+        reader = csv.reader(f)
+        header = next(reader, [])
+        idx = {h: i for i, h in enumerate(header)}
+        row: List[str] = []
+
+        def g(k: str) -> str:
+            i = idx.get(k, -1)
+            return row[i].strip() if 0 <= i < len(row) else ""
+
         for row in reader:
-            pid = (row.get("podcast_id") or "").strip()
+            pid = g("podcast_id")
             if not pid or pid.startswith("#"):
                 continue
-            out[pid] = PodcastConfig.from_row(row)
+            out[pid] = PodcastConfig._from_getter(g)
     return out
 
 
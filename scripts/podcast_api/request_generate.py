@@ -2,16 +2,19 @@ from __future__ import annotations
 
 import argparse
 import os
-from typing import List
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional, Tuple
 
 from .episodes_requests import (
     DEFAULT_TABLE_PATH,
+    EpisodeRequest,
     EpisodesRequestsTable,
     find_next_for_request,
+    index_by_status,
     mark_failed_request,
     mark_requested,
 )
-from .podcasts_table import DEFAULT_PODCASTS_PATH, load_podcasts_table
+from .podcasts_table import DEFAULT_PODCASTS_PATH, PodcastConfig, load_podcasts_table
 from .podcast_api_client import PodcastApiClient
 from .url_sources import fetch_contexts_from_urls
 
@@ -24,6 +27,28 @@ def _split_urls(cell: str) -> List[str]:
     return [u.strip() for u in cell.split(";") if u.strip()]
 
 
+def _process_task(r: EpisodeRequest, pc: Optional[PodcastConfig], client: PodcastApiClient, max_chars: int) -> str:
+    # Runs on a worker thread: network only, no table mutation.
+    length = (
+        (pc.podcast_api_length if pc and pc.podcast_api_length else "STANDARD").strip() or "STANDARD"
+    )
+
+    urls = _split_urls(r.source_urls)
+    contexts_text = fetch_contexts_from_urls(urls, max_chars_per_url=max_chars)
+    if not contexts_text:
+        contexts_text = ["No external sources were provided."]
+
+    op = client.create_podcast(
+        title=r.title or f"Task {r.task_id}",
+        description=r.description or "",
+        language_code=(pc.language if pc and pc.language else "en-US"),
+        focus=r.custom_prompt,
+        length=length,
+        contexts=contexts_text,
+    )
+    return op.name
+
+
 def main() -> int:
     ap = argparse.ArgumentParser(description="Request Google Podcast API audio for all pending tasks")
     ap.add_argument(
@@ -40,6 +65,12 @@ def main() -> int:
     ap.add_argument("--max_chars_per_url", type=int, default=20000)
     ap.add_argument("--project_id", default=None, help="Override GCP project id")
     ap.add_argument("--token", default=None, help="Override access token")
+    ap.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.environ.get("REQUEST_WORKERS", "4")),
+        help="Concurrent create_podcast calls",
+    )
     args = ap.parse_args()
 
     token = args.token or os.getenv("GOOGLE_ACCESS_TOKEN", "").strip()
@@ -49,48 +80,47 @@ def main() -> int:
     podcasts = load_podcasts_table(args.podcasts)
     table = EpisodesRequestsTable(args.table)
     reqs = table.load()
+    by_status = index_by_status(reqs)
 
     attempted = 0
     succeeded = 0
+    runnable: List[Tuple[EpisodeRequest, Optional[PodcastConfig], PodcastApiClient]] = []
+    # One client (and connection pool) per project, shared by its tasks.
+    clients: Dict[str, PodcastApiClient] = {}
     while attempted < args.max_tasks:
-        r = find_next_for_request(reqs)
+        r = find_next_for_request(reqs, by_status)
         if not r:
             break
+        attempted += 1
 
         pc = podcasts.get(r.podcast_id)
         project_id = (args.project_id or (pc.gcp_project_id if pc else "")).strip()
         if not project_id:
             mark_failed_request(r, "Missing gcp_project_id")
-            attempted += 1
             continue
-
-        length = (
-            (pc.podcast_api_length if pc and pc.podcast_api_length else "STANDARD").strip() or "STANDARD"
-        )
-
-        urls = _split_urls(r.source_urls)
-        contexts_text = fetch_contexts_from_urls(urls, max_chars_per_url=args.max_chars_per_url)
-        if not contexts_text:
-            contexts_text = ["No external sources were provided."]
-
-        try:
-            client = PodcastApiClient(project_id=project_id, access_token=token)
-            op = client.create_podcast(
-                title=r.title or f"Task {r.task_id}",
-                description=r.description or "",
-                language_code=(pc.language if pc and pc.language else "en-US"),
-                focus=r.custom_prompt,
-                length=length,
-                contexts=contexts_text,
-            )
-            mark_requested(r, operation_name=op.name)
-            print(f"[podcast_api] requested task_id={r.task_id} op={op.name}")
-            succeeded += 1
-        except Exception as e:
-            mark_failed_request(r, str(e))
-            print(f"[podcast_api][warn] request failed task_id={r.task_id} err={e}")
-
-        attempted += 1
+        client = clients.get(project_id)
+        if client is None:
+            client = clients[project_id] = PodcastApiClient(project_id=project_id, access_token=token)
+        runnable.append((r, pc, client))
+
+    if runnable:
+        workers = max(1, min(args.workers, len(runnable)))
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            futures = {
+                ex.submit(_process_task, r, pc, client, args.max_chars_per_url): r
+                for r, pc, client in runnable
+            }
+            # Table updates stay on the main thread.
+            for fut in as_completed(futures):
+                r = futures[fut]
+                try:
+                    op_name = fut.result()
+                    mark_requested(r, operation_name=op_name)
+                    print(f"[podcast_api] requested task_id={r.task_id} op={op_name}")
+                    succeeded += 1
+                except Exception as e:
+                    mark_failed_request(r, str(e))
+                    print(f"[podcast_api][warn] request failed task_id={r.task_id} err={e}")
 
     table.save(reqs)
     print(f"[podcast_api] attempted_count={attempted} requested_count={succeeded}")
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+from typing import Callable, Tuple, TypeVar
+
+T = TypeVar("T")
+
+CACHE_DIR = os.environ.get("PODCAST_API_CACHE_DIR", os.path.join("data", ".cache"))
+
+
+def cached_parse(kind: str, path: str, parse: Callable[[str], T], extra: Tuple[str, ...] = ()) -> T:
+    # Parsed tables are pickled under CACHE_DIR keyed by (path, mtime, size, extra).
+    # The cache is best-effort: any problem with it falls back to parsing the file.
+    try:
+        st = os.stat(path)
+    except OSError:
+        return parse(path)
+    abspath = os.path.abspath(path)
+    key = (abspath, st.st_mtime_ns, st.st_size, extra)
+    digest = hashlib.blake2b(f"{kind}:{abspath}".encode("utf-8"), digest_size=8).hexdigest()
+    cache_path = os.path.join(CACHE_DIR, f"{kind}_{digest}.pkl")
+
+    try:
+        with open(cache_path, "rb") as f:
+            cached_key, data = pickle.load(f)
+        if cached_key == key:
+            return data
+    except Exception:
+        pass
+
+    data = parse(path)
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp_path = cache_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump((key, data), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except Exception:
+        pass
+    return data
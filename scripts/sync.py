@@ -3,16 +3,26 @@ import sys
 import re
 import json
 import hashlib
+import io
 import time
+import shutil
 import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
-from email.utils import format_datetime
+from email.utils import format_datetime, parsedate_to_datetime
 from xml.sax.saxutils import escape
 
 import requests
+from requests.adapters import HTTPAdapter
 import feedparser
 from dateutil import parser as dtparser
 
+try:
+    import orjson
+except ImportError:  # stdlib json fallback; output is byte-identical
+    orjson = None
+
 # When this file is executed as "python scripts/sync.py", Python sets sys.path[0]
 # to the scripts/ directory. That breaks absolute imports like "from scripts.X"
 # because the repo root is not on sys.path. Add repo root explicitly.
@@ -45,6 +55,12 @@ RSS_OUT = "feed/rss.xml"
 TMP_DIR = "audio_tmp"
 PODCAST_REG_FILE = "data/video-data/podcast_reg.csv"
 
+# One pooled keep-alive session for every HTTP call (GitHub API, uploads and
+# source audio hosts) instead of a fresh connection per request.
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=0))
+_ASSETS_LOCK = threading.Lock()
+
 os.makedirs("data", exist_ok=True)
 os.makedirs("feed", exist_ok=True)
 os.makedirs(TMP_DIR, exist_ok=True)
@@ -52,9 +68,13 @@ os.makedirs(TMP_DIR, exist_ok=True)
 # -----------------------------
 # Utility: safe filename (FIXED: was missing)
 # -----------------------------
+_SAFE_RE = re.compile(r"[^a-zA-Z0-9._-]+")
+_NUMID_RE = re.compile(r"(\d{5,})")
+_MP3_SUFFIX_RE = re.compile(r"\.mp3$", re.IGNORECASE)
+
 def safe_filename(s: str) -> str:
     s = (s or "").strip()
-    s = re.sub(r"[^a-zA-Z0-9._-]+", "_", s).strip("_")
+    s = _SAFE_RE.sub("_", s).strip("_")
     return s[:180] if s else "episode"
 
 # -----------------------------
@@ -78,8 +98,10 @@ def parse_pubdate(entry) -> datetime:
 # -----------------------------
 # Stable identity + duplicate prevention
 # -----------------------------
-def source_key(entry) -> str:
-    # 1) enclosure
+def source_key(entry, enclosure_href: str | None = None) -> str:
+    # 1) enclosure (callers that already validated it pass it in)
+    if enclosure_href and enclosure_href.startswith("http"):
+        return "enclosure:" + enclosure_href
     try:
         if entry.get("enclosures"):
             href = entry.enclosures[0].get("href") or ""
@@ -102,7 +124,7 @@ def generate_guid(entry) -> str:
     raw = str(entry.get("id") or entry.get("guid") or entry.get("link") or "")
 
     # Extract a long numeric token if present (RSS episode id)
-    m = re.search(r"(\d{5,})", raw)
+    m = _NUMID_RE.search(raw)
     if m:
         return f"agenda-{m.group(1)}"
 
@@ -124,7 +146,7 @@ def gh_headers(token: str, extra: dict | None = None) -> dict:
     return h
 
 def ensure_release(repo: str, token: str, tag: str) -> dict:
-    r = requests.get(
+    r = _SESSION.get(
         f"https://api.github.com/repos/{repo}/releases/tags/{tag}",
         headers=gh_headers(token),
         timeout=60,
@@ -132,7 +154,7 @@ def ensure_release(repo: str, token: str, tag: str) -> dict:
     if r.status_code == 200:
         return r.json()
 
-    r = requests.post(
+    r = _SESSION.post(
         f"https://api.github.com/repos/{repo}/releases",
         headers=gh_headers(token),
         json={"tag_name": tag, "name": tag, "draft": False, "prerelease": False},
@@ -142,23 +164,57 @@ def ensure_release(repo: str, token: str, tag: str) -> dict:
     return r.json()
 
 def list_assets(token: str, release: dict) -> list:
-    r = requests.get(release["assets_url"], headers=gh_headers(token), timeout=60)
+    r = _SESSION.get(release["assets_url"], headers=gh_headers(token), timeout=60)
     r.raise_for_status()
     return r.json()
 
+def list_all_assets(token: str, release: dict) -> dict:
+    # Every asset on the release, keyed by name. Fetched once per run; the
+    # assets endpoint pages at 30 by default, so list_assets() alone can miss
+    # older assets.
+    out = {}
+    page = 1
+    while True:
+        r = _SESSION.get(
+            release["assets_url"],
+            headers=gh_headers(token),
+            params={"per_page": 100, "page": page},
+            timeout=60,
+        )
+        r.raise_for_status()
+        batch = r.json()
+        if not batch:
+            return out
+        for a in batch:
+            out[a.get("name")] = a
+        page += 1
+
 def delete_asset(token: str, asset_api_url: str) -> None:
-    r = requests.delete(asset_api_url, headers=gh_headers(token), timeout=60)
+    r = _SESSION.delete(asset_api_url, headers=gh_headers(token), timeout=60)
     if r.status_code not in (204, 404):
         r.raise_for_status()
 
-def upload_asset(token: str, release: dict, file_path: str) -> None:
+# Upload responses worth retrying: timeouts, rate limiting and the
+# intermittent 5xx that uploads.github.com returns.
+_RETRY_STATUSES = frozenset({408, 429, 500, 502, 503, 504})
+
+def _retry_after_sec(r) -> float:
+    try:
+        return float(r.headers.get("Retry-After") or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+def upload_asset(token: str, release: dict, file_path: str, asset_index: dict | None = None) -> None:
     filename = os.path.basename(file_path)
+    if asset_index is None:
+        asset_index = list_all_assets(token, release)
 
-    # Idempotency: remove asset with same name
-    for a in list_assets(token, release):
-        if a.get("name") == filename:
-            delete_asset(token, a["url"])
-            break
+    # Idempotency: remove asset with same name. Serialized because uploads
+    # run concurrently and share asset_index.
+    with _ASSETS_LOCK:
+        old = asset_index.pop(filename, None)
+    if old and old.get("url"):
+        delete_asset(token, old["url"])
 
     upload_url = release["upload_url"].split("{")[0]
 
@@ -169,22 +225,40 @@ def upload_asset(token: str, release: dict, file_path: str) -> None:
 
     last_err: Exception | None = None
 
+    # Explicit length: GitHub requires it and it avoids any chunked fallback.
+    size = os.path.getsize(file_path)
+    headers = gh_headers(token, {"Content-Type": "audio/mpeg", "Content-Length": str(size)})
+
     for attempt in range(1, max_attempts + 1):
         try:
+            # Reopened per attempt so a retry always sends from byte 0.
             with open(file_path, "rb") as f:
-                r = requests.post(
+                r = _SESSION.post(
                     f"{upload_url}?name={filename}",
-                    headers=gh_headers(token, {"Content-Type": "audio/mpeg"}),
+                    headers=headers,
                     data=f,
                     timeout=(10, 300),
                 )
             r.raise_for_status()
+            with _ASSETS_LOCK:
+                asset_index[filename] = r.json()
             return
-        except (requests.exceptions.SSLError, requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+        except (
+            requests.exceptions.SSLError,
+            requests.exceptions.ConnectionError,
+            requests.exceptions.Timeout,
+            requests.exceptions.HTTPError,
+        ) as e:
+            resp = getattr(e, "response", None) if isinstance(e, requests.exceptions.HTTPError) else None
+            if resp is not None and resp.status_code not in _RETRY_STATUSES:
+                # Permanent 4xx (bad request, validation): retrying cannot help.
+                raise
             last_err = e
             if attempt >= max_attempts:
                 break
             sleep_sec = base_sleep * (2 ** (attempt - 1))
+            if resp is not None:
+                sleep_sec = max(sleep_sec, _retry_after_sec(resp))
             print(f"[sync][upload][warn] transient upload error attempt={attempt}/{max_attempts} file={filename} err={type(e).__name__}: {e}")
             print(f"[sync][upload][warn] retrying in {sleep_sec:.1f}s")
             time.sleep(sleep_sec)
@@ -218,15 +292,16 @@ def resolve_download_url(url: str) -> str:
 
     # HEAD may be blocked; fallback to GET
     try:
-        r = requests.head(url, headers=headers, allow_redirects=True, timeout=60)
+        r = _SESSION.head(url, headers=headers, allow_redirects=True, timeout=60)
         if r.status_code < 400 and r.url:
             return r.url
     except Exception:
         pass
 
-    r = requests.get(url, headers=headers, allow_redirects=True, stream=True, timeout=60)
-    r.raise_for_status()
-    return r.url or url
+    # Only the final URL is needed; closing returns the connection to the pool.
+    with _SESSION.get(url, headers=headers, allow_redirects=True, stream=True, timeout=60) as r:
+        r.raise_for_status()
+        return r.url or url
 
 def download_file(url: str, out_path: str) -> int:
     headers = {
@@ -234,23 +309,24 @@ def download_file(url: str, out_path: str) -> int:
         "Referer": RSS,
         "Accept": "*/*",
     }
-    with requests.get(url, headers=headers, stream=True, timeout=300, allow_redirects=True) as r:
+    with _SESSION.get(url, headers=headers, stream=True, timeout=300, allow_redirects=True) as r:
         r.raise_for_status()
-        total = 0
+        # Copy straight from the socket in 1 MiB reads; decode_content keeps the
+        # transparent gzip/deflate handling iter_content provided.
+        r.raw.decode_content = True
         with open(out_path, "wb") as f:
-            for chunk in r.iter_content(chunk_size=1024 * 256):
-                if chunk:
-                    f.write(chunk)
-                    total += len(chunk)
-        return total
+            shutil.copyfileobj(r.raw, f, length=1024 * 1024)
+        return os.path.getsize(out_path)
 
 # -----------------------------
 # RSS building
 # -----------------------------
 def build_rss(episodes_sorted: list) -> str:
-    now = format_datetime(datetime.now(timezone.utc))
+    now_dt = datetime.now(timezone.utc)
+    now = format_datetime(now_dt)
     atom_self = escape(f"{PODCAST_LINK.rstrip('/')}/feed/rss.xml")
     image_url = escape(PODCAST_IMAGE) if PODCAST_IMAGE else ""
+    show_title = escape(PODCAST_TITLE)
 
     if ITUNES_CATEGORY and ITUNES_SUBCATEGORY:
         cat_block = (
@@ -261,54 +337,74 @@ def build_rss(episodes_sorted: list) -> str:
     else:
         cat_block = f'<itunes:category text="{escape(ITUNES_CATEGORY)}"/>'
 
-    items = []
-    for ep in episodes_sorted:
-        title = escape(ep["title"])
-        guid = escape(ep["guid"])
-        pubdate = escape(ep["pubDate_rfc822"])
-        enc_url = escape(ep["audio_url"])  # absolute URL
-        desc_html = ep.get("description_html", "")
-
-        items.append(f"""    <item>
-      <title>{title}</title>
-      <itunes:title>{title}</itunes:title>
-      <guid isPermaLink="false">{guid}</guid>
-      <pubDate>{pubdate}</pubDate>
-      <description><![CDATA[{desc_html}]]></description>
-      <enclosure url="{enc_url}" length="{int(ep.get("length_bytes", 0))}" type="audio/mpeg"/>
-      <itunes:explicit>false</itunes:explicit>
-    </item>""")
-
-    return f"""<?xml version="1.0" encoding="utf-8"?>
+    # Written piecewise into one buffer rather than one f-string per item
+    # plus a final join.
+    buf = io.StringIO()
+    w = buf.write
+    w(f"""<?xml version="1.0" encoding="utf-8"?>
 <rss version="2.0"
   xmlns:atom="http://www.w3.org/2005/Atom"
   xmlns:itunes="http://www.itunes.com/dtds/podcast-1.0.dtd">
   <channel>
     <atom:link href="{atom_self}" rel="self" type="application/rss+xml"/>
-    <title>{escape(PODCAST_TITLE)}</title>
+    <title>{show_title}</title>
     <link>{escape(PODCAST_LINK)}</link>
     <language>en-us</language>
-    <copyright>© {datetime.now(timezone.utc).year} {escape(PODCAST_TITLE)}</copyright>
+    <copyright>© {now_dt.year} {show_title}</copyright>
     <description><![CDATA[{PODCAST_DESCRIPTION}]]></description>
     <lastBuildDate>{now}</lastBuildDate>
-    <itunes:author>{escape(PODCAST_TITLE)}</itunes:author>
+    <itunes:author>{show_title}</itunes:author>
     <itunes:type>episodic</itunes:type>
     <itunes:explicit>false</itunes:explicit>
     {f'<itunes:image href="{image_url}"/>' if image_url else ""}
     {cat_block}
-{os.linesep.join(items)}
+""")
+
+    sep = ""
+    for ep in episodes_sorted:
+        title = escape(ep["title"])
+        w(sep)
+        w("    <item>\n      <title>")
+        w(title)
+        w("</title>\n      <itunes:title>")
+        w(title)
+        w('</itunes:title>\n      <guid isPermaLink="false">')
+        w(escape(ep["guid"]))
+        w("</guid>\n      <pubDate>")
+        w(escape(ep["pubDate_rfc822"]))
+        w("</pubDate>\n      <description><![CDATA[")
+        w(ep.get("description_html", ""))
+        w(']]></description>\n      <enclosure url="')
+        w(escape(ep["audio_url"]))  # absolute URL
+        w('" length="')
+        w(str(int(ep.get("length_bytes", 0))))
+        w('" type="audio/mpeg"/>\n      <itunes:explicit>false</itunes:explicit>\n    </item>')
+        sep = os.linesep
+
+    w("""
   </channel>
 </rss>
-"""
+""")
+    return buf.getvalue()
 
 # -----------------------------
 # Episode sorting
 # -----------------------------
-def sort_datetime(ep: dict) -> datetime:
+def sort_datetime(ep: dict) -> float:
+    # pubDate_rfc822 is written by format_datetime, so the stdlib RFC 2822
+    # parser handles it; dateutil is only the fallback for odd legacy values.
+    # Returns a UTC timestamp so naive and aware values compare cleanly.
+    v = ep.get("pubDate_rfc822") or ""
     try:
-        return dtparser.parse(ep.get("pubDate_rfc822", "1970-01-01T00:00:00Z"))
-    except Exception:
-        return datetime(1970, 1, 1, tzinfo=timezone.utc)
+        dt = parsedate_to_datetime(v)
+    except (TypeError, ValueError):
+        try:
+            dt = dtparser.parse(v or "1970-01-01T00:00:00Z")
+        except Exception:
+            return 0.0
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
 
 # -----------------------------
 # State I/O (backward compatible)
@@ -317,13 +413,24 @@ def load_state() -> dict:
     if not os.path.exists(DATA_FILE):
         return {"episodes": {}}
 
-    with open(DATA_FILE, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    if orjson is not None:
+        with open(DATA_FILE, "rb") as f:
+            data = orjson.loads(f.read())
+    else:
+        with open(DATA_FILE, "r", encoding="utf-8") as f:
+            data = json.load(f)
 
     episodes = data.get("episodes")
 
     if isinstance(episodes, dict):
-        return {"episodes": episodes}
+        state = {"episodes": episodes}
+        # Validators from the last fully successful fetch of the source feed.
+        for k in ("feed_etag", "feed_modified"):
+            if isinstance(data.get(k), str) and data[k]:
+                state[k] = data[k]
+        if isinstance(data.get("release"), dict):
+            state["release"] = data["release"]
+        return state
 
     # If older schema used a list, salvage as best possible
     if isinstance(episodes, list):
@@ -337,9 +444,97 @@ def load_state() -> dict:
 
     return {"episodes": {}}
 
+def _read_bytes(path: str) -> bytes | None:
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except OSError:
+        return None
+
 def save_state(state: dict) -> None:
-    with open(DATA_FILE, "w", encoding="utf-8") as f:
-        json.dump(state, f, ensure_ascii=False, indent=2)
+    # orjson's OPT_INDENT_2 matches json.dumps(ensure_ascii=False, indent=2)
+    # byte for byte, so switching encoders does not churn the committed file.
+    if orjson is not None:
+        data = orjson.dumps(state, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    else:
+        data = json.dumps(state, ensure_ascii=False, indent=2).encode("utf-8")
+    # Leave the file (and its mtime) alone when nothing changed this run.
+    if _read_bytes(DATA_FILE) == data:
+        return
+    with open(DATA_FILE, "wb") as f:
+        f.write(data)
+
+# Parts of feed/rss.xml that differ between runs without any content change:
+# lastBuildDate is stamped on every build, and the sync workflow injects an
+# <itunes:owner> block after the script has written the file.
+_RSS_VOLATILE_RE = re.compile(rb"<lastBuildDate>[^<]*</lastBuildDate>|\n<itunes:owner>.*?</itunes:owner>", re.S)
+
+def write_rss(rss_xml: str) -> None:
+    # Only rewrite the feed when real content differs, so no-op runs leave
+    # nothing to commit.
+    data = rss_xml.encode("utf-8")
+    old = _read_bytes(RSS_OUT)
+    if old is not None and _RSS_VOLATILE_RE.sub(b"", old) == _RSS_VOLATILE_RE.sub(b"", data):
+        return
+    with open(RSS_OUT, "wb") as f:
+        f.write(data)
+
+_RELEASE_FIELDS = ("id", "tag_name", "upload_url", "assets_url")
+
+def _load_release(state: dict) -> tuple:
+    # The release from the previous run is cached in state, so the steady
+    # state skips the releases/tags lookup. The asset listing doubles as the
+    # existence check: a 404 there means the cached release is gone.
+    cached = state.get("release")
+    if isinstance(cached, dict) and cached.get("tag_name") == RELEASE_TAG and all(cached.get(k) for k in _RELEASE_FIELDS):
+        try:
+            return cached, list_all_assets(GITHUB_TOKEN, cached)
+        except requests.exceptions.HTTPError as e:
+            if e.response is None or e.response.status_code != 404:
+                raise
+            print(f"[sync][warn] cached release {cached.get('id')} not found; looking it up again")
+
+    release = ensure_release(REPO, GITHUB_TOKEN, RELEASE_TAG)
+    state["release"] = {k: release.get(k) for k in _RELEASE_FIELDS}
+    return release, list_all_assets(GITHUB_TOKEN, release)
+
+def _set_feed_validators(state: dict, src, complete: bool) -> None:
+    etag = getattr(src, "etag", None) if complete else None
+    modified = getattr(src, "modified", None) if complete else None
+    for k, v in (("feed_etag", etag), ("feed_modified", modified)):
+        if isinstance(v, str) and v:
+            state[k] = v
+        else:
+            state.pop(k, None)
+
+
+# -----------------------------
+# Per-episode archive (runs on worker threads)
+# -----------------------------
+def _process_group(release: dict, asset_index: dict, filename: str, items: list) -> list:
+    # Download + upload every entry sharing one asset filename, in feed order.
+    # Returns (item, filename, length_bytes or None on download failure).
+    out = []
+    tmp_path = os.path.join(TMP_DIR, filename)
+    for item in items:
+        title, audio_src = item[3], item[5]
+        try:
+            final_url = resolve_download_url(audio_src)
+            length = download_file(final_url, tmp_path)
+        except Exception as e:
+            print(f"WARNING: download failed for '{title}': {e}")
+            # Do not publish an episode without a valid enclosure
+            out.append((item, filename, None))
+            continue
+
+        upload_asset(GITHUB_TOKEN, release, tmp_path, asset_index)
+        out.append((item, filename, length))
+
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+    return out
 
 
 # -----------------------------
@@ -364,7 +559,11 @@ def main():
     existing_episode_count = len(episodes_map)
 
     # Parse SOURCE feed
-    src = feedparser.parse(RSS)
+    # Conditional GET: an unchanged source feed comes back as 304 with no body.
+    src = feedparser.parse(RSS, etag=state.get("feed_etag"), modified=state.get("feed_modified"))
+    if getattr(src, "status", None) == 304 and os.path.exists(RSS_OUT):
+        print(f"OK. SOURCE RSS not modified. Preserved {existing_episode_count} existing episodes.")
+        return
     reg = load_podcast_reg(PODCAST_REG_FILE)
     podcast_name = str(src.feed.get("title") or PODCAST_TITLE).strip()
     # Backfill podcast fields for existing episodes in-place (single-source feed context)
@@ -380,30 +579,29 @@ def main():
         # Even if SOURCE RSS has no entries, preserve existing episodes
         episodes = list(episodes_map.values())
         episodes.sort(key=sort_datetime, reverse=True)
-        
+
+        _set_feed_validators(state, src, complete=True)
         save_state(state)
-        with open(RSS_OUT, "w", encoding="utf-8") as f:
-            f.write(build_rss(episodes))
+        write_rss(build_rss(episodes))
         print(f"OK. SOURCE RSS has no entries. Preserved {len(episodes_map)} existing episodes.")
         return
 
-    release = ensure_release(REPO, GITHUB_TOKEN, RELEASE_TAG)
+    # name -> asset, kept current as uploads replace assets during the run.
+    release, asset_index = _load_release(state)
 
     new_count = 0
     skipped_no_http = 0
     skipped_download_errors = 0
+    reused_assets = 0
 
-    for entry in src.entries:
-        skey = source_key(entry)
+    # Episodes needing download+upload, grouped by asset filename. Groups run
+    # concurrently; a group stays sequential so two entries that map to the
+    # same asset name never race on the temp file or the release asset.
+    pending: dict = {}
 
-        # If already known, reuse GUID forever to avoid duplicates in directories
-        existing = episodes_map.get(skey) if isinstance(episodes_map.get(skey), dict) else None
-        if existing and existing.get("guid"):
-            guid = existing["guid"]
-        else:
-            guid = generate_guid(entry)
-
-        # Get enclosure
+    for entry in src.entries:
+        # Get enclosure first: entries without a usable one are skipped before
+        # any key or GUID hashing.
         if not entry.get("enclosures"):
             continue
 
@@ -412,6 +610,15 @@ def main():
             skipped_no_http += 1
             continue
 
+        skey = source_key(entry, audio_src if isinstance(audio_src, str) else None)
+
+        # If already known, reuse GUID forever to avoid duplicates in directories
+        existing = episodes_map.get(skey) if isinstance(episodes_map.get(skey), dict) else None
+        if existing and existing.get("guid"):
+            guid = existing["guid"]
+        else:
+            guid = generate_guid(entry)
+
         title = entry.get("title", "Untitled")
         pub_dt = parse_pubdate(entry)
         pub_rfc822 = format_datetime(pub_dt)
@@ -433,40 +640,54 @@ def main():
 
         # Download and upload
         filename = safe_filename(f"{pub_dt.strftime('%Y%m%d')}-{title}")
-        filename = re.sub(r"\.mp3$", "", filename, flags=re.IGNORECASE) + ".mp3"
-        tmp_path = os.path.join(TMP_DIR, filename)
+        filename = _MP3_SUFFIX_RE.sub("", filename) + ".mp3"
 
-        try:
-            final_url = resolve_download_url(audio_src)
-            length = download_file(final_url, tmp_path)
-        except Exception as e:
-            skipped_download_errors += 1
-            print(f"WARNING: download failed for '{title}': {e}")
-            # Do not publish an episode without a valid enclosure
+        # State lost or reset but the asset is already on the release: reuse it.
+        # A crash mid-upload can leave a partial asset that is not "uploaded";
+        # that one goes to pending, where upload_asset deletes and replaces it.
+        asset = asset_index.get(filename)
+        if asset and asset.get("state") == "uploaded" and asset.get("size") and filename not in pending:
+            episodes_map[skey] = {
+                "source_key": skey,
+                "guid": guid,
+                "podcast_id": derive_podcast_id(entry, src.feed, podcast_name, reg, env_title=PODCAST_TITLE, default_pid="default"),
+                "podcast_name": podcast_name,
+                "title": title,
+                "pubDate_rfc822": pub_rfc822,
+                "audio_url": f"https://github.com/{REPO}/releases/download/{RELEASE_TAG}/{filename}",
+                "length_bytes": int(asset.get("size") or 0),
+                "description_html": entry.get("summary", ""),
+            }
+            reused_assets += 1
             continue
 
-        upload_asset(GITHUB_TOKEN, release, tmp_path)
-
-        target_url = f"https://github.com/{REPO}/releases/download/{RELEASE_TAG}/{filename}"
-
-        episodes_map[skey] = {
-            "source_key": skey,
-            "guid": guid,
-            "podcast_id": derive_podcast_id(entry, src.feed, podcast_name, reg, env_title=PODCAST_TITLE, default_pid="default"),
-            "podcast_name": podcast_name,
-            "title": title,
-            "pubDate_rfc822": pub_rfc822,
-            "audio_url": target_url,
-            "length_bytes": int(length),
-            "description_html": entry.get("summary", ""),
-        }
-
-        try:
-            os.remove(tmp_path)
-        except OSError:
-            pass
-
-        new_count += 1
+        pending.setdefault(filename, []).append((entry, skey, guid, title, pub_rfc822, audio_src))
+
+    workers = max(1, int(os.environ.get("SYNC_WORKERS", "6") or "6"))
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        futures = [ex.submit(_process_group, release, asset_index, filename, items) for filename, items in pending.items()]
+        # episodes_map is only written here, on the main thread.
+        for fut in as_completed(futures):
+            for (entry, skey, guid, title, pub_rfc822, _audio_src), filename, length in fut.result():
+                if length is None:
+                    skipped_download_errors += 1
+                    continue
+
+                target_url = f"https://github.com/{REPO}/releases/download/{RELEASE_TAG}/{filename}"
+
+                episodes_map[skey] = {
+                    "source_key": skey,
+                    "guid": guid,
+                    "podcast_id": derive_podcast_id(entry, src.feed, podcast_name, reg, env_title=PODCAST_TITLE, default_pid="default"),
+                    "podcast_name": podcast_name,
+                    "title": title,
+                    "pubDate_rfc822": pub_rfc822,
+                    "audio_url": target_url,
+                    "length_bytes": int(length),
+                    "description_html": entry.get("summary", ""),
+                }
+
+                new_count += 1
 
     # Sort episodes newest-first for RSS output
     episodes = list(episodes_map.values())
@@ -474,6 +695,9 @@ def main():
 
     # Persist state and RSS
     state["episodes"] = episodes_map
+    # Only trust a 304 next time if every entry was archived; otherwise keep
+    # fetching the full feed so failed downloads are retried.
+    _set_feed_validators(state, src, complete=(skipped_download_errors == 0))
     save_state(state)
 
     rss_xml = build_rss(episodes)
@@ -482,16 +706,19 @@ def main():
     if "buzzsp" in rss_xml.lower():
         raise RuntimeError("ERROR: 'buzzsp' detected in final RSS output. Aborting.")
 
-    with open(RSS_OUT, "w", encoding="utf-8") as f:
-        f.write(rss_xml)
+    write_rss(rss_xml)
 
     print(
         f"OK. New archived: {new_count}. "
         f"Existing episodes preserved: {existing_episode_count}. "
         f"Total episodes in state: {len(episodes_map)}. "
         f"Skipped non-http enclosures: {skipped_no_http}. "
-        f"Download errors: {skipped_download_errors}."
+        f"Download errors: {skipped_download_errors}. "
+        f"Reused release assets: {reused_assets}."
     )
 
 if __name__ == "__main__":
-    main()
+    try:
+        main()
+    finally:
+        _SESSION.close()
@@ -1,12 +1,19 @@
 # ASCII-only. No ellipses. Keep <= 500 lines.
+import csv
+import functools
 import os
 import re
 from typing import Dict, Any
 
 
+_WS_RE = re.compile(r"\s+")
+
+
+@functools.lru_cache(maxsize=1024)
 def _norm_name(s: str) -> str:
+    # Pure and called with the same few podcast names over and over.
     s = (s or "").strip().lower()
-    s = re.sub(r"\s+", " ", s)
+    s = _WS_RE.sub(" ", s)
     return s
 
 
@@ -16,25 +23,21 @@ def load_podcast_reg(csv_path: str) -> Dict[str, str]:
     if not os.path.exists(csv_path):
         return {}
     try:
-        with open(csv_path, "r", encoding="utf-8") as f:
-            lines = [ln.strip() for ln in f.read().splitlines() if ln.strip()]
-        if not lines:
-            return {}
-        header = [h.strip() for h in lines[0].split(",")]
-        if "podcast_name" not in header or "podcast_id" not in header:
-            return {}
-        name_idx = header.index("podcast_name")
-        id_idx = header.index("podcast_id")
-        out: Dict[str, str] = {}
-        for ln in lines[1:]:
-            parts = [c.strip() for c in ln.split(",")]
-            if len(parts) <= max(name_idx, id_idx):
-                continue
-            nm = _norm_name(parts[name_idx])
-            pid = (parts[id_idx] or "").strip()
-            if nm and pid:
-                out[nm] = pid
-        return out
+        # csv handles quoted commas in names; the C reader also does the splitting.
+        with open(csv_path, "r", encoding="utf-8", newline="") as f:
+            reader = csv.reader(f)
+            header = [h.strip() for h in next(reader, [])]
+            if "podcast_name" not in header or "podcast_id" not in header:
+                return {}
+            name_idx = header.index("podcast_name")
+            id_idx = header.index("podcast_id")
+            width = max(name_idx, id_idx)
+            pairs = [
+                (_norm_name(row[name_idx]), row[id_idx].strip())
+                for row in reader
+                if len(row) > width
+            ]
+        return {nm: pid for nm, pid in pairs if nm and pid}
     except Exception:
         return {}
 
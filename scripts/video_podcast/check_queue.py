@@ -8,12 +8,13 @@ from pathlib import Path
 from typing import Dict, List, Optional, Set, Tuple
 
 from .tables import (
+    QueueMode,
     ensure_podcasts_csv,
     ensure_queue_mode,
     ensure_videos_csv,
+    iter_videos,
     load_podcasts,
     load_queue_mode,
-    load_videos,
     pick_default_podcast_id,
 )
 
@@ -27,11 +28,7 @@ class QueueDecision:
     reason: str
 
 
-def _active_podcasts(repo_root: Path) -> List[str]:
-    ensure_podcasts_csv(repo_root)
-    ensure_queue_mode(repo_root)
-    podcasts = load_podcasts(repo_root)
-    mode = load_queue_mode(repo_root)
+def _active_podcasts(podcasts: Dict[str, Dict[str, str]], mode: QueueMode) -> List[str]:
     if mode.run_all_podcasts:
         return sorted(podcasts.keys())
     pid = mode.podcast_id.strip()
@@ -50,22 +47,27 @@ def decide_next(repo_root: Path) -> QueueDecision:
       4) Only when all rendered: upload first row with empty youtube_id
     """
     ensure_videos_csv(repo_root)
+    ensure_podcasts_csv(repo_root)
+    ensure_queue_mode(repo_root)
+    # Loaded once here and handed to _active_podcasts.
     podcasts = load_podcasts(repo_root)
-    active = _active_podcasts(repo_root)
-    rows = load_videos(repo_root)
+    mode = load_queue_mode(repo_root)
+    active = _active_podcasts(podcasts, mode)
 
+    # One pass over the sorted file. Render wins over upload, so the first
+    # pending render ends the scan; the first pending upload is remembered.
     active_set: Set[str] = set(active)
-    rows = [r for r in rows if (r.get("podcast_id") or "").strip() in active_set]
-
-    if not rows:
-        return QueueDecision(action="none", podcast_id="", guid=None, title=None, reason="no_rows=1")
-
-    # Render backlog first.
-    for r in rows:
-        if (r.get("rendered_asset_name") or "").strip() == "":
-            pid = (r.get("podcast_id") or "").strip()
-            guid = (r.get("episode_guid") or "").strip() or None
-            title = (r.get("episode_title") or "").strip() or None
+    seen = False
+    pending_upload: Optional[Dict[str, str]] = None
+    # iter_videos rows carry every field, already stripped.
+    for r in iter_videos(repo_root):
+        if r["podcast_id"] not in active_set:
+            continue
+        seen = True
+        if r["rendered_asset_name"] == "":
+            pid = r["podcast_id"]
+            guid = r["episode_guid"] or None
+            title = r["episode_title"] or None
             return QueueDecision(
                 action="render",
                 podcast_id=pid,
@@ -73,20 +75,25 @@ def decide_next(repo_root: Path) -> QueueDecision:
                 title=title,
                 reason="pending_render=1",
             )
+        if pending_upload is None and r["youtube_id"] == "":
+            pending_upload = r
+
+    if not seen:
+        return QueueDecision(action="none", podcast_id="", guid=None, title=None, reason="no_rows=1")
 
     # All rendered: upload next missing youtube_id.
-    for r in rows:
-        if (r.get("youtube_id") or "").strip() == "":
-            pid = (r.get("podcast_id") or "").strip()
-            guid = (r.get("episode_guid") or "").strip() or None
-            title = (r.get("episode_title") or "").strip() or None
-            return QueueDecision(
-                action="upload",
-                podcast_id=pid,
-                guid=guid,
-                title=title,
-                reason="all_rendered=1 not_uploaded=1",
-            )
+    if pending_upload is not None:
+        r = pending_upload
+        pid = r["podcast_id"]
+        guid = r["episode_guid"] or None
+        title = r["episode_title"] or None
+        return QueueDecision(
+            action="upload",
+            podcast_id=pid,
+            guid=guid,
+            title=title,
+            reason="all_rendered=1 not_uploaded=1",
+        )
 
     return QueueDecision(action="none", podcast_id="", guid=None, title=None, reason="all_done=1")
 
@@ -96,16 +103,15 @@ def _write_github_outputs(dec: QueueDecision) -> None:
     if not out_path:
         return
     p = Path(out_path)
-    lines = [
-        "action=%s" % dec.action,
-        "podcast_id=%s" % (dec.podcast_id or ""),
-        "guid=%s" % (dec.guid or ""),
-        "title=%s" % (dec.title or ""),
-        "reason=%s" % dec.reason,
-    ]
+    payload = (
+        f"action={dec.action}\n"
+        f"podcast_id={dec.podcast_id or ''}\n"
+        f"guid={dec.guid or ''}\n"
+        f"title={dec.title or ''}\n"
+        f"reason={dec.reason}\n"
+    )
     with p.open("a", encoding="utf-8") as f:
-        for ln in lines:
-            f.write(ln + "\n")
+        f.write(payload)
 
 
 def main(argv: Optional[List[str]] = None) -> int:
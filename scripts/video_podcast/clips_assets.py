@@ -0,0 +1,238 @@
+# ASCII-only. No ellipses. Keep <= 500 lines.
+
+import contextlib
+import os
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterator, List, Set, Tuple
+
+try:
+    import fcntl
+except ImportError:  # not POSIX
+    fcntl = None
+
+from .ffmpeg_ops import ffmpeg_make_clip
+from .util import HttpPool, download, ffprobe_duration_sec, load_json, save_json
+
+
+CLIP_SEC = 15.0
+MIN_ASSET_SEC = 16.0
+
+FETCH_WORKERS = 4
+ENCODE_WORKERS = max(1, (os.cpu_count() or 2) // 2)
+# Each concurrent encode gets an equal share of the CPUs, so x264's frame
+# threads in parallel jobs do not oversubscribe the runner.
+THREADS_PER_ENCODE = max(1, (os.cpu_count() or 2) // ENCODE_WORKERS)
+
+# Keep-alive connections to the stock-video CDNs, shared by the fetch threads.
+_HTTP = HttpPool()
+
+
+def _asset_key(a: Dict[str, Any]) -> str:
+    return "%s-%s" % (a["source"], a["asset_id"])
+
+
+@contextlib.contextmanager
+def _asset_lock(src_path: Path) -> Iterator[None]:
+    # raw_dir is shared across episodes; serialize processes touching the
+    # same file. The lock file is removed while still held, so it does not
+    # pile up in the cache; a waiter that wakes on the unlinked file sees
+    # the inode changed and locks again.
+    src_path.parent.mkdir(parents=True, exist_ok=True)
+    if fcntl is None:
+        yield
+        return
+    lock_path = str(src_path) + ".lock"
+    while True:
+        with open(lock_path, "a") as lf:
+            fcntl.flock(lf.fileno(), fcntl.LOCK_EX)
+            try:
+                same = os.stat(lock_path).st_ino == os.fstat(lf.fileno()).st_ino
+            except FileNotFoundError:
+                same = False
+            if not same:
+                continue
+            try:
+                yield
+            finally:
+                os.unlink(lock_path)
+            return
+
+
+def _fetch_one(src_path: Path, url: str, durs: Dict[str, float]) -> Tuple[Path, float]:
+    # Network-bound: download (once) and probe the raw asset. Durations are
+    # remembered per (name, size) so a replaced file is probed again.
+    if not src_path.exists():
+        with _asset_lock(src_path):
+            if not src_path.exists():
+                # Download beside the target and rename, so other episodes
+                # never see a partial file under the final name.
+                part = src_path.with_name(src_path.name + ".part")
+                download(url, part, pool=_HTTP)
+                os.replace(part, src_path)
+    dkey = "%s:%d" % (src_path.name, src_path.stat().st_size)
+    dur = durs.get(dkey)
+    if not dur:
+        dur = ffprobe_duration_sec(src_path)
+        durs[dkey] = dur
+    return src_path, dur
+
+
+def _load_durations(p: Path) -> Dict[str, float]:
+    try:
+        d = load_json(p)
+    except Exception:
+        return {}
+    return d if isinstance(d, dict) else {}
+
+
+def _save_durations(p: Path, durs: Dict[str, float]) -> None:
+    # Merge into what other episodes saved meanwhile, then swap the file in
+    # whole so a concurrent reader never sees it half written.
+    with _asset_lock(p):
+        merged = _load_durations(p)
+        merged.update(durs)
+        tmp = p.with_name("%s.%d.tmp" % (p.name, os.getpid()))
+        save_json(tmp, merged)
+        os.replace(tmp, p)
+
+
+def _encode_one(src_path: Path, dst: Path, start: float) -> Path:
+    # CPU-bound in the ffmpeg child; the calling thread just waits on it.
+    ffmpeg_make_clip(src_path, dst, start, CLIP_SEC, threads=THREADS_PER_ENCODE)
+    return dst
+
+
+@dataclass
+class ProvColumns:
+    """Provenance of made clips, one list per field (row i is clip i).
+
+    Rows are only materialized as dicts for the clips that end up in
+    clips_meta.json.
+    """
+
+    source: List[str] = field(default_factory=list)
+    asset_id: List[str] = field(default_factory=list)
+    tier: List[str] = field(default_factory=list)
+    author: List[str] = field(default_factory=list)
+    page_url: List[str] = field(default_factory=list)
+    download_url: List[str] = field(default_factory=list)
+    license_url: List[str] = field(default_factory=list)
+    start_sec: List[float] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.source)
+
+    def append(self, a: Dict[str, Any], start: float) -> None:
+        self.source.append(a["source"])
+        self.asset_id.append(a["asset_id"])
+        self.tier.append(str(a.get("tier") or ""))
+        self.author.append(a.get("author") or "")
+        self.page_url.append(a.get("page_url") or "")
+        self.download_url.append(a.get("download_url") or "")
+        self.license_url.append(a.get("license_url") or "")
+        self.start_sec.append(round(start, 3))
+
+    def row(self, i: int) -> Dict[str, Any]:
+        return {
+            "source": self.source[i],
+            "asset_id": self.asset_id[i],
+            "tier": self.tier[i],
+            "author": self.author[i],
+            "page_url": self.page_url[i],
+            "download_url": self.download_url[i],
+            "license_url": self.license_url[i],
+            "start_sec": self.start_sec[i],
+            "duration_sec": round(CLIP_SEC, 3),
+        }
+
+    def to_rows(self) -> List[Dict[str, Any]]:
+        return [self.row(i) for i in range(len(self))]
+
+
+def make_from_assets(
+    work: Path,
+    raw_dir: Path,
+    assets: List[Dict[str, Any]],
+    rng,
+    limit: int,
+    clip_prefix: str,
+) -> Tuple[List[Path], ProvColumns]:
+    """Cut up to limit clips from assets, cycling the list at most 3 times.
+
+    Downloads run a few candidates ahead on FETCH_WORKERS threads while
+    ffmpeg encodes run on ENCODE_WORKERS threads, so the next asset downloads
+    while the previous clip encodes. Start offsets are drawn on this thread
+    before dispatch and results are taken in candidate order, so the output
+    does not depend on worker timing.
+    """
+    made: List[Path] = []
+    prov = ProvColumns()
+    if not assets or limit <= 0:
+        return made, prov
+    durs_path = raw_dir / "_durations.json"
+    durs = _load_durations(durs_path)
+    n_durs = len(durs)
+    n_cand = len(assets) * 3
+    draws = [rng.random() for _ in range(n_cand)]
+    fetches: Dict[str, Future] = {}
+    # Assets that failed to download or are too short; later laps skip them.
+    bad: Set[str] = set()
+    n_unique = len({_asset_key(a) for a in assets})
+    inflight: Deque[Tuple[Future, Dict[str, Any], float]] = deque()
+
+    def prefetch(i: int) -> None:
+        if i < n_cand:
+            a = assets[i % len(assets)]
+            key = _asset_key(a)
+            if key not in fetches and key not in bad:
+                src_path = raw_dir / ("%s.mp4" % key)
+                fetches[key] = fetch_ex.submit(_fetch_one, src_path, a["download_url"], durs)
+
+    def collect() -> None:
+        fut, a, start = inflight.popleft()
+        try:
+            made.append(fut.result())
+            prov.append(a, start)
+        except Exception:
+            pass
+
+    fetch_ex = ThreadPoolExecutor(max_workers=FETCH_WORKERS)
+    enc_ex = ThreadPoolExecutor(max_workers=ENCODE_WORKERS)
+    try:
+        clip_i = 0
+        for i in range(n_cand):
+            if len(made) >= limit or len(bad) == n_unique:
+                break
+            a = assets[i % len(assets)]
+            key = _asset_key(a)
+            if key in bad:
+                continue
+            for j in range(i, i + FETCH_WORKERS):
+                prefetch(j)
+            try:
+                src_path, dur = fetches[key].result()
+            except Exception:
+                bad.add(key)
+                continue
+            if dur < MIN_ASSET_SEC:
+                bad.add(key)
+                continue
+            max_start = max(0.0, dur - CLIP_SEC)
+            start = draws[i] * max_start
+            tmp_clip = work / ("%s_%04d.mp4" % (clip_prefix, clip_i))
+            clip_i += 1
+            inflight.append((enc_ex.submit(_encode_one, src_path, tmp_clip, start), a, start))
+            # Never queue more encodes than could still be needed.
+            while inflight and (len(inflight) >= ENCODE_WORKERS or len(made) + len(inflight) >= limit):
+                collect()
+        while inflight:
+            collect()
+    finally:
+        fetch_ex.shutdown(wait=True, cancel_futures=True)
+        enc_ex.shutdown(wait=True, cancel_futures=True)
+    if len(durs) != n_durs:
+        _save_durations(durs_path, durs)
+    return made, prov
@@ -1,142 +1,142 @@
 # ASCII-only. No ellipses. Keep <= 500 lines.
 
+import hashlib
+import json
 import os
 import shutil
-import zipfile
+import time
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Tuple
 
-from .ffmpeg_ops import ffmpeg_make_clip
+from .clips_assets import CLIP_SEC, ProvColumns, make_from_assets
+from .clips_zip import count_clips, list_clips, unzip_to, zip_clips
 from .github_release import download_release_asset
 from .sources import apply_sensitive_query_policy, build_tiered_queries, search_assets
-from .util import download, ffprobe_duration_sec, now_iso, rand_for_guid, save_json, load_json, sha256_file, strip_html
+from .util import now_iso, rand_for_guid, save_json, load_json, sha256_file, strip_html
 
 
-CLIP_SEC = 15.0
-MIN_ASSET_SEC = 16.0
+SEARCH_TTL_SEC = 6 * 3600
+
+ASSET_CACHE_DIR = os.environ.get("CLIP_ASSET_CACHE_DIR", "").strip()
 
 TIER_1 = 1
 TIER_2 = 2
 TIER_3 = 3
 
 
-def count_clips(dirp: Path) -> int:
-    if not dirp.exists():
-        return 0
-    return len(list(dirp.glob("clip_*.mp4")))
-
-
 def sprinkle_positions(n_total: int, n_generic: int, rng) -> List[int]:
+    """Spread n_generic positions over range(n_total), one per bucket.
+
+    With n_generic < n_total every bucket [round(i*b), round((i+1)*b) - 1]
+    is non-empty and they are disjoint and increasing, so a draw can never
+    collide with an earlier one and the picks come out sorted. A pick that
+    lands right after the previous one is nudged forward by one.
+    """
     if n_total <= 0 or n_generic <= 0:
         return []
     if n_generic >= n_total:
         return list(range(n_total))
 
     bucket = float(n_total) / float(n_generic)
-    picks: List[int] = []
-    used = set()
+    last = n_total - 1
+    out: List[int] = []
+    hi_edge = 0
     for i in range(n_generic):
-        lo = int(round(i * bucket))
-        hi = int(round((i + 1) * bucket)) - 1
-        if lo < 0:
-            lo = 0
-        if hi >= n_total:
-            hi = n_total - 1
-        if hi < lo:
-            hi = lo
-
-        cand = lo
-        if hi > lo:
-            cand = rng.randint(lo, hi)
-
-        if cand in used:
-            for d in range(1, n_total):
-                c1 = cand + d
-                c2 = cand - d
-                if c1 < n_total and c1 not in used:
-                    cand = c1
-                    break
-                if c2 >= 0 and c2 not in used:
-                    cand = c2
-                    break
-        used.add(cand)
-        picks.append(cand)
-
-    picks.sort()
-    adjusted: List[int] = []
-    used2 = set()
-    for p in picks:
-        cand = p
-        if adjusted and cand == adjusted[-1] + 1:
-            if cand + 1 < n_total and (cand + 1) not in used2:
-                cand = cand + 1
-            elif cand - 1 >= 0 and (cand - 1) not in used2:
-                cand = cand - 1
-        used2.add(cand)
-        adjusted.append(cand)
-    adjusted.sort()
-    return adjusted
-
-
-def zip_clips(src_dir: Path, meta_path: Path, zip_path: Path) -> None:
-    zip_path.parent.mkdir(parents=True, exist_ok=True)
-    with zipfile.ZipFile(zip_path, "w", compression=zipfile.ZIP_DEFLATED) as z:
-        for p in sorted(src_dir.glob("clip_*.mp4")):
-            z.write(p, arcname=p.name)
-        z.write(meta_path, arcname=meta_path.name)
-
-
-def unzip_to(zip_path: Path, dst_dir: Path) -> None:
-    dst_dir.mkdir(parents=True, exist_ok=True)
-    with zipfile.ZipFile(zip_path, "r") as z:
-        z.extractall(dst_dir)
-
-
-def _make_from_assets(
-    work: Path,
-    raw_dir: Path,
-    assets: List[Dict[str, Any]],
-    rng,
-    limit: int,
-    clip_prefix: str,
-) -> Tuple[List[Path], List[Dict[str, Any]]]:
-    made: List[Path] = []
-    prov: List[Dict[str, Any]] = []
-    pick_i = 0
-    clip_i = 0
-    if not assets:
-        return made, prov
-    while len(made) < limit and pick_i < len(assets) * 3:
-        a = assets[pick_i % len(assets)]
-        pick_i += 1
-        asset_key = "%s-%s" % (a["source"], a["asset_id"])
-        src_path = raw_dir / ("%s.mp4" % asset_key)
-        try:
-            if not src_path.exists():
-                download(a["download_url"], src_path)
-            dur = ffprobe_duration_sec(src_path)
-            if dur < MIN_ASSET_SEC:
-                continue
-            max_start = max(0.0, dur - CLIP_SEC)
-            start = rng.uniform(0.0, max_start) if max_start > 0 else 0.0
-            tmp_clip = work / ("%s_%04d.mp4" % (clip_prefix, clip_i))
-            ffmpeg_make_clip(src_path, tmp_clip, start, CLIP_SEC)
-            made.append(tmp_clip)
-            prov.append({
-                "source": a["source"],
-                "asset_id": a["asset_id"],
-                "tier": str(a.get("tier") or ""),
-                "author": a.get("author") or "",
-                "page_url": a.get("page_url") or "",
-                "download_url": a.get("download_url") or "",
-                "license_url": a.get("license_url") or "",
-                "start_sec": round(start, 3),
-                "duration_sec": round(CLIP_SEC, 3),
-            })
-            clip_i += 1
-        except Exception:
-            continue
-    return made, prov
+        lo = hi_edge
+        hi_edge = int(round((i + 1) * bucket))
+        hi = min(hi_edge - 1, last)
+        cand = rng.randint(lo, hi) if hi > lo else lo
+        if out and cand == out[-1] + 1 and cand < last:
+            cand += 1
+        out.append(cand)
+    return out
+
+
+def partial_shuffle(arr: List[Any], k: int, rng) -> None:
+    """Shuffle only the first k slots (partial Fisher-Yates).
+
+    arr[:k] ends up a uniform random sample in random order; the rest keeps
+    no useful order, so only use it on lists read no further than k.
+    """
+    n = len(arr)
+    for i in range(min(k, n - 1)):
+        j = rng.randrange(i, n)
+        arr[i], arr[j] = arr[j], arr[i]
+
+
+def _place(src: Path, dst: Path) -> None:
+    # Hardlink when possible (same filesystem under work/); copy otherwise.
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copyfile(src, dst)
+
+
+def _query_plan(title: str, desc_html: str) -> List[Dict[str, Any]]:
+    desc_text = strip_html(desc_html)
+    tiered_orig = build_tiered_queries(title, desc_text, max_q=12)
+    q_orig = [str(x.get("query") or "") for x in tiered_orig]
+    q_filtered, _policy = apply_sensitive_query_policy(title, desc_text, q_orig, max_q=12)
+    tiered_final: List[Dict[str, Any]] = []
+    for item in tiered_orig:
+        q = str(item.get("query") or "")
+        if q in q_filtered:
+            tiered_final.append({"tier": int(item.get("tier") or 3), "query": q})
+    for q in q_filtered:
+        if not any(str(it.get("query") or "") == q for it in tiered_final):
+            tiered_final.append({"tier": 3, "query": q})
+    return tiered_final
+
+
+def _cached_query_plan(cache_dir: Path, title: str, desc_html: str) -> List[Dict[str, Any]]:
+    # The plan is a pure function of (title, desc_html); re-runs of an
+    # episode read it back instead of recomputing it.
+    key = hashlib.sha256((title + "\x00" + desc_html).encode("utf-8")).hexdigest()[:16]
+    p = cache_dir / ("%s.json" % key)
+    try:
+        hit = load_json(p)
+        if isinstance(hit, list):
+            return hit
+    except (OSError, ValueError):
+        pass
+    plan = _query_plan(title, desc_html)
+    save_json(p, plan)
+    return plan
+
+
+def _local_clips_ok(guid: str, clips_dir: Path, meta_path: Path, need: int) -> bool:
+    # A complete set left in work/ by an earlier run makes the release
+    # download unnecessary.
+    if count_clips(clips_dir) < need or not meta_path.exists():
+        return False
+    try:
+        meta = load_json(meta_path)
+    except Exception:
+        return False
+    return isinstance(meta, dict) and meta.get("guid") == guid and meta.get("clips_count") == need
+
+
+def _cached_search(
+    cache_dir: Path,
+    pexels_key: str,
+    pixabay_key: str,
+    tiered: List[Dict[str, Any]],
+) -> List[Dict[str, Any]]:
+    # Stock search results keyed by the query plan, shared across episodes
+    # and re-runs for SEARCH_TTL_SEC.
+    key = hashlib.sha256(json.dumps(tiered, sort_keys=True).encode("utf-8")).hexdigest()
+    p = cache_dir / ("%s.json" % key)
+    try:
+        if time.time() - p.stat().st_mtime < SEARCH_TTL_SEC:
+            hit = load_json(p)
+            if isinstance(hit, list):
+                return hit
+    except (OSError, ValueError):
+        pass
+    assets = search_assets(pexels_key, pixabay_key, tiered)
+    if assets:
+        save_json(p, assets)
+    return assets
 
 
 def ensure_clips(
@@ -153,7 +153,8 @@ def ensure_clips(
     rng = rand_for_guid(guid)
     work = tmp_dir / guid
     work.mkdir(parents=True, exist_ok=True)
-    raw_dir = work / "raw"
+    # Raw stock assets are keyed by source and id, so episodes share them.
+    raw_dir = Path(ASSET_CACHE_DIR) if ASSET_CACHE_DIR else tmp_dir / "_raw"
     clips_ordered_dir = work / "clips_ordered"
     clips_meta_path = work / "clips_meta.json"
 
@@ -161,41 +162,40 @@ def ensure_clips(
     clip_zip_asset = "clips_%s.zip" % guid
     clip_zip_path = work / clip_zip_asset
 
-    reused = False
+    reused = _local_clips_ok(guid, clips_ordered_dir, clips_meta_path, need)
     generated = False
+    sha = ""
+
+    tiered_final = _cached_query_plan(tmp_dir / "_qplan", title, desc_html)
+
+    search_cache_dir = tmp_dir / ".search_cache"
 
-    if gh_token and download_release_asset(repo, clips_tag, clip_zip_asset, gh_token, clip_zip_path):
+    # Searched only when clips must be generated or extended, so a reused
+    # bundle costs no stock API quota.
+    def searched() -> List[Dict[str, Any]]:
+        return _cached_search(search_cache_dir, pexels_key, pixabay_key, tiered_final)
+
+    if not reused and gh_token and download_release_asset(repo, clips_tag, clip_zip_asset, gh_token, clip_zip_path):
+        # Extract straight into clips_ordered; an unusable bundle is removed
+        # again so generation below starts from an empty directory.
+        shutil.rmtree(clips_ordered_dir, ignore_errors=True)
         try:
-            reuse_dir = work / "clips_reuse"
-            shutil.rmtree(reuse_dir, ignore_errors=True)
-            unzip_to(clip_zip_path, reuse_dir)
-            meta_in = reuse_dir / "clips_meta.json"
-            if meta_in.exists() and count_clips(reuse_dir) >= 1:
-                shutil.rmtree(clips_ordered_dir, ignore_errors=True)
-                shutil.copytree(reuse_dir, clips_ordered_dir)
+            unzip_to(clip_zip_path, clips_ordered_dir)
+            meta_in = clips_ordered_dir / "clips_meta.json"
+            if meta_in.exists() and count_clips(clips_ordered_dir) >= 1:
                 shutil.copyfile(meta_in, clips_meta_path)
                 reused = True
         except Exception:
             reused = False
+        if not reused:
+            shutil.rmtree(clips_ordered_dir, ignore_errors=True)
 
-    desc_text = strip_html(desc_html)
-    tiered_orig = build_tiered_queries(title, desc_text, max_q=12)
-    q_orig = [str(x.get("query") or "") for x in tiered_orig]
-    q_filtered, _policy = apply_sensitive_query_policy(title, desc_text, q_orig, max_q=12)
-    tiered_final: List[Dict[str, Any]] = []
-    for item in tiered_orig:
-        q = str(item.get("query") or "")
-        if q in q_filtered:
-            tiered_final.append({"tier": int(item.get("tier") or 3), "query": q})
-    for q in q_filtered:
-        if not any(str(it.get("query") or "") == q for it in tiered_final):
-            tiered_final.append({"tier": 3, "query": q})
     assets_by_tier = {TIER_1: [], TIER_2: [], TIER_3: []}
 
     if not clips_ordered_dir.exists() or count_clips(clips_ordered_dir) < 1:
         if not (pexels_key and pixabay_key):
             raise RuntimeError("API keys are required to generate clips")
-        assets_all = search_assets(pexels_key, pixabay_key, tiered_final)
+        assets_all = searched()
         for a in assets_all:
             tier = int(a.get("tier") or 3)
             if tier <= 1:
@@ -205,6 +205,7 @@ def ensure_clips(
             else:
                 assets_by_tier[TIER_3].append(a)
         for t in [TIER_1, TIER_2, TIER_3]:
+            # make_from_assets may cycle the whole list, so shuffle all of it.
             rng.shuffle(assets_by_tier[t])
 
         raw_dir.mkdir(parents=True, exist_ok=True)
@@ -212,33 +213,40 @@ def ensure_clips(
         main_assets = list(assets_by_tier[TIER_1]) + list(assets_by_tier[TIER_2])
         generic_assets = list(assets_by_tier[TIER_3])
 
-        clips_main, prov_main = _make_from_assets(work, raw_dir, main_assets, rng, need, "main")
+        clips_main, prov_main = make_from_assets(work, raw_dir, main_assets, rng, need, "main")
         if len(clips_main) < 1:
             raise RuntimeError("no usable clips produced")
 
         generic_needed = max(0, need - len(clips_main))
         clips_generic: List[Path] = []
-        prov_generic: List[Dict[str, Any]] = []
+        prov_generic = ProvColumns()
         if generic_needed > 0:
-            clips_generic, prov_generic = _make_from_assets(work, raw_dir, generic_assets, rng, generic_needed, "gen")
+            clips_generic, prov_generic = make_from_assets(work, raw_dir, generic_assets, rng, generic_needed, "gen")
 
         if len(clips_main) + len(clips_generic) < need:
             raise RuntimeError("insufficient clips")
 
         order_generic = sprinkle_positions(need, generic_needed, rng)
-        rng.shuffle(clips_main)
-        rng.shuffle(clips_generic)
+        # Shuffle indices so each clip keeps its own provenance row.
+        main_order = list(range(len(clips_main)))
+        gen_order = list(range(len(clips_generic)))
+        partial_shuffle(main_order, need, rng)
+        partial_shuffle(gen_order, need, rng)
 
         seq: List[Tuple[Path, Dict[str, Any]]] = []
         mi = 0
         gi = 0
-        gset = set(order_generic)
+        gmask = 0
+        for k in order_generic:
+            gmask |= 1 << k
         for i in range(need):
-            if i in gset:
-                seq.append((clips_generic[gi], prov_generic[gi]))
+            if gmask >> i & 1:
+                k = gen_order[gi]
+                seq.append((clips_generic[k], prov_generic.row(k)))
                 gi += 1
             else:
-                seq.append((clips_main[mi], prov_main[mi]))
+                k = main_order[mi]
+                seq.append((clips_main[k], prov_main.row(k)))
                 mi += 1
 
         shutil.rmtree(clips_ordered_dir, ignore_errors=True)
@@ -246,10 +254,10 @@ def ensure_clips(
         prov_final: List[Dict[str, Any]] = []
         for idx, (p, info) in enumerate(seq):
             dst = clips_ordered_dir / ("clip_%04d.mp4" % idx)
-            shutil.copyfile(p, dst)
-            row = dict(info)
-            row["clip_index"] = idx
-            prov_final.append(row)
+            _place(p, dst)
+            # ProvColumns.row() already returned a fresh dict.
+            info["clip_index"] = idx
+            prov_final.append(info)
 
         clip_meta = {
             "guid": guid,
@@ -261,7 +269,7 @@ def ensure_clips(
             "generic_positions": order_generic,
         }
         save_json(clips_meta_path, clip_meta)
-        zip_clips(clips_ordered_dir, clips_meta_path, clip_zip_path)
+        sha = zip_clips(clips_ordered_dir, clips_meta_path, clip_zip_path)
         generated = True
 
     if reused and count_clips(clips_ordered_dir) < need:
@@ -269,41 +277,49 @@ def ensure_clips(
         if not (pexels_key and pixabay_key):
             raise RuntimeError("API keys are required to extend clips")
 
-        assets_all2 = search_assets(pexels_key, pixabay_key, tiered_final)
+        assets_all2 = searched()
         generic_assets2 = [a for a in assets_all2 if int(a.get("tier") or 3) >= 3]
         rng.shuffle(generic_assets2)
         raw_dir.mkdir(parents=True, exist_ok=True)
 
         add_n = need - count_clips(clips_ordered_dir)
-        clips_more, prov_more = _make_from_assets(work, raw_dir, generic_assets2, rng, add_n, "add")
+        clips_more, prov_more = make_from_assets(work, raw_dir, generic_assets2, rng, add_n, "add")
         if len(clips_more) < add_n:
             raise RuntimeError("insufficient clips")
 
-        existing = sorted(clips_ordered_dir.glob("clip_*.mp4"))
+        # Move the reused clips aside: clips_ordered is rebuilt below and
+        # they are placed back from here.
+        prev_dir = work / "clips_prev"
+        shutil.rmtree(prev_dir, ignore_errors=True)
+        clips_ordered_dir.rename(prev_dir)
+        existing = list_clips(prev_dir)
         existing_meta = load_json(clips_meta_path) if clips_meta_path.exists() else {}
         existing_prov = existing_meta.get("provenance") if isinstance(existing_meta, dict) else None
         if not isinstance(existing_prov, list):
             existing_prov = []
 
-        seq2: List[Tuple[Path, Dict[str, Any]]] = []
+        # One pass: bucket existing then new clips by tier, keeping order.
+        gen_items: List[Tuple[Path, Dict[str, Any]]] = []
+        main_items: List[Tuple[Path, Dict[str, Any]]] = []
         for i, p in enumerate(existing):
             info = existing_prov[i] if i < len(existing_prov) and isinstance(existing_prov[i], dict) else {}
-            seq2.append((p, info))
+            (gen_items if int(info.get("tier") or 3) == TIER_3 else main_items).append((p, info))
         for i in range(add_n):
-            seq2.append((clips_more[i], prov_more[i]))
+            info = prov_more.row(i)
+            (gen_items if int(info.get("tier") or 3) == TIER_3 else main_items).append((clips_more[i], info))
 
         order_generic = sprinkle_positions(need, add_n, rng)
-        gen_items = [(p, info) for (p, info) in seq2 if int(info.get("tier") or 3) == TIER_3]
-        main_items = [(p, info) for (p, info) in seq2 if int(info.get("tier") or 3) != TIER_3]
-        rng.shuffle(gen_items)
-        rng.shuffle(main_items)
+        partial_shuffle(gen_items, need, rng)
+        partial_shuffle(main_items, need, rng)
 
         seq_final: List[Tuple[Path, Dict[str, Any]]] = []
         mi = 0
         gi = 0
-        gset = set(order_generic)
+        gmask = 0
+        for k in order_generic:
+            gmask |= 1 << k
         for i in range(need):
-            if i in gset:
+            if gmask >> i & 1:
                 seq_final.append(gen_items[gi])
                 gi += 1
             else:
@@ -315,10 +331,11 @@ def ensure_clips(
         prov_final: List[Dict[str, Any]] = []
         for idx, (p, info) in enumerate(seq_final):
             dst = clips_ordered_dir / ("clip_%04d.mp4" % idx)
-            shutil.copyfile(p, dst)
+            _place(p, dst)
             row = dict(info)
             row["clip_index"] = idx
             prov_final.append(row)
+        shutil.rmtree(prev_dir, ignore_errors=True)
 
         clip_meta = {
             "guid": guid,
@@ -330,10 +347,11 @@ def ensure_clips(
             "generic_positions": order_generic,
         }
         save_json(clips_meta_path, clip_meta)
-        zip_clips(clips_ordered_dir, clips_meta_path, clip_zip_path)
+        sha = zip_clips(clips_ordered_dir, clips_meta_path, clip_zip_path)
         generated = True
 
-    sha = sha256_file(clip_zip_path) if clip_zip_path.exists() else ""
+    if not generated:
+        sha = sha256_file(clip_zip_path) if clip_zip_path.exists() else ""
     return {
         "clips_dir": clips_ordered_dir,
         "clips_meta_path": clips_meta_path,
@@ -0,0 +1,95 @@
+# ASCII-only. No ellipses. Keep <= 500 lines.
+
+import hashlib
+import os
+import shutil
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List
+
+
+_IO_BUF = 1 << 20
+
+
+def _is_clip(e: os.DirEntry) -> bool:
+    n = e.name
+    return n.startswith("clip_") and n.endswith(".mp4") and e.is_file(follow_symlinks=False)
+
+
+def count_clips(dirp: Path) -> int:
+    try:
+        with os.scandir(dirp) as it:
+            return sum(1 for e in it if _is_clip(e))
+    except FileNotFoundError:
+        return 0
+
+
+def list_clips(dirp: Path) -> List[Path]:
+    """clip_*.mp4 files in dirp, sorted by name."""
+    try:
+        with os.scandir(dirp) as it:
+            names = sorted(e.name for e in it if _is_clip(e))
+    except FileNotFoundError:
+        return []
+    return [dirp / n for n in names]
+
+
+class _HashingWriter:
+    """Write-only file wrapper that sha256-hashes everything written.
+
+    It deliberately has no seek/tell, so ZipFile streams (data descriptors
+    after each member) and never rewrites earlier bytes; the running hash
+    is then the hash of the finished file.
+    """
+
+    def __init__(self, f) -> None:
+        self.f = f
+        self.h = hashlib.sha256()
+
+    def write(self, b) -> int:
+        self.h.update(b)
+        return self.f.write(b)
+
+    def flush(self) -> None:
+        self.f.flush()
+
+
+def zip_clips(src_dir: Path, meta_path: Path, zip_path: Path) -> str:
+    """Write the clip bundle and return its sha256 hex digest."""
+    zip_path.parent.mkdir(parents=True, exist_ok=True)
+    # H.264 does not deflate; store clips as-is and compress only the JSON.
+    # Clip data is copied in 1 MiB chunks through a 1 MiB buffered archive
+    # handle instead of ZipFile.write's 8 KiB reads.
+    with open(zip_path, "wb", buffering=_IO_BUF) as out:
+        hw = _HashingWriter(out)
+        with zipfile.ZipFile(hw, "w", compression=zipfile.ZIP_STORED) as z:
+            for p in list_clips(src_dir):
+                zinfo = zipfile.ZipInfo.from_file(p, arcname=p.name)
+                with open(p, "rb", buffering=_IO_BUF) as sf, z.open(zinfo, "w") as zf:
+                    shutil.copyfileobj(sf, zf, length=_IO_BUF)
+            z.write(meta_path, arcname=meta_path.name, compress_type=zipfile.ZIP_DEFLATED)
+    return hw.h.hexdigest()
+
+
+def _extract_one(zip_path: Path, name: str, dst_dir: Path) -> None:
+    # Own ZipFile handle per call: handles are not safe to share across threads.
+    with zipfile.ZipFile(zip_path, "r") as z:
+        info = z.getinfo(name)
+        if "/" in name or "\\" in name or name in (".", ".."):
+            # Bundles are flat; leave anything else to extract()'s path sanitizing.
+            z.extract(info, dst_dir)
+            return
+        with z.open(info) as src, open(dst_dir / name, "wb", buffering=_IO_BUF) as dst:
+            shutil.copyfileobj(src, dst, length=_IO_BUF)
+
+
+def unzip_to(zip_path: Path, dst_dir: Path) -> None:
+    dst_dir.mkdir(parents=True, exist_ok=True)
+    with zipfile.ZipFile(zip_path, "r") as z:
+        names = z.namelist()
+    if not names:
+        return
+    # Members are independent and mostly stored, so extraction parallelizes.
+    with ThreadPoolExecutor(max_workers=min(8, len(names))) as ex:
+        list(ex.map(lambda n: _extract_one(zip_path, n, dst_dir), names))
@@ -0,0 +1,181 @@
+# ASCII-only. No ellipses. Keep <= 500 lines.
+"""H.264 encoder selection shared by every ffmpeg command builder.
+
+VIDEO_HWACCEL=auto|nvenc|qsv|vaapi|off picks the encoder. auto tries the
+hardware encoders in order and keeps the first one that can encode a tiny
+test clip; anything that fails falls back to libx264. VIDEO_X264_PRESET
+(default veryfast) sets the libx264 preset.
+"""
+import functools
+import os
+import subprocess
+from typing import List, Tuple
+
+HWACCEL_CHOICES = ("auto", "nvenc", "qsv", "vaapi", "off")
+VAAPI_DEVICE = os.getenv("VIDEO_VAAPI_DEVICE", "/dev/dri/renderD128").strip() or "/dev/dri/renderD128"
+
+_ENCODERS = {
+    "nvenc": ("h264_nvenc", ("-preset", "p4", "-tune", "hq", "-rc", "vbr", "-cq", "23")),
+    "qsv": ("h264_qsv", ("-preset", "medium", "-global_quality", "23")),
+    "vaapi": ("h264_vaapi", ()),
+}
+X264_PRESETS = (
+    "ultrafast", "superfast", "veryfast", "faster", "fast",
+    "medium", "slow", "slower", "veryslow", "placebo",
+)
+_AUTO_ORDER = ("nvenc", "qsv", "vaapi")
+
+
+def _hwaccel_mode() -> str:
+    mode = os.getenv("VIDEO_HWACCEL", "auto").strip().lower() or "auto"
+    if mode not in HWACCEL_CHOICES:
+        print("[encoder][warn] unknown VIDEO_HWACCEL=%s using auto" % mode, flush=True)
+        return "auto"
+    return mode
+
+
+def _device_args_for(name: str) -> List[str]:
+    if name == "h264_vaapi":
+        return ["-vaapi_device", VAAPI_DEVICE]
+    if name == "h264_qsv":
+        return ["-init_hw_device", "qsv=hw", "-filter_hw_device", "hw"]
+    return []
+
+
+def _upload_filter_for(name: str) -> str:
+    if name == "h264_vaapi":
+        return "format=nv12,hwupload"
+    if name == "h264_qsv":
+        return "format=nv12,hwupload=extra_hw_frames=64"
+    return ""
+
+
+@functools.lru_cache(maxsize=1)
+def _software_encoder() -> Tuple[str, Tuple[str, ...]]:
+    # VIDEO_X264_PRESET trades quality for speed, e.g. ultrafast on CI.
+    preset = os.getenv("VIDEO_X264_PRESET", "veryfast").strip().lower() or "veryfast"
+    if preset not in X264_PRESETS:
+        print("[encoder][warn] unknown VIDEO_X264_PRESET=%s using veryfast" % preset, flush=True)
+        preset = "veryfast"
+    opts: Tuple[str, ...] = ("-preset", preset)
+    if preset == "ultrafast":
+        # No B-frames and a short lookahead, so ultrafast does not stall on them.
+        opts += ("-tune", "zerolatency", "-x264-params", "rc-lookahead=10:ref=1:bframes=0")
+    return "libx264", opts
+
+
+@functools.lru_cache(maxsize=1)
+def _listed_encoders() -> str:
+    try:
+        cp = subprocess.run(
+            ["ffmpeg", "-hide_banner", "-encoders"],
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, timeout=30,
+        )
+        return cp.stdout or ""
+    except Exception:
+        return ""
+
+
+def _can_encode(name: str) -> bool:
+    # Builds often list hardware encoders the runner has no device for, so
+    # listing alone is not enough: encode a few frames to be sure.
+    if (" %s " % name) not in _listed_encoders():
+        return False
+    cmd = ["ffmpeg", "-hide_banner", "-v", "error"] + _device_args_for(name)
+    cmd += ["-f", "lavfi", "-i", "color=c=black:s=256x144:r=30:d=0.2"]
+    up = _upload_filter_for(name)
+    if up:
+        cmd += ["-vf", up]
+    cmd += ["-c:v", name, "-f", "null", "-"]
+    try:
+        return subprocess.run(
+            cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=60,
+        ).returncode == 0
+    except Exception:
+        return False
+
+
+@functools.lru_cache(maxsize=1)
+def _pick_h264_encoder() -> Tuple[str, Tuple[str, ...]]:
+    """Return (encoder_name, encoder_options), probed once per process."""
+    mode = _hwaccel_mode()
+    if mode == "off":
+        return _software_encoder()
+    order = _AUTO_ORDER if mode == "auto" else (mode,)
+    for key in order:
+        name, opts = _ENCODERS[key]
+        if _can_encode(name):
+            print("[encoder] VIDEO_HWACCEL=%s using=%s" % (mode, name), flush=True)
+            return name, opts
+        if mode != "auto":
+            print("[encoder][warn] %s not usable, falling back to libx264" % name, flush=True)
+    print("[encoder] VIDEO_HWACCEL=%s using=libx264" % mode, flush=True)
+    return _software_encoder()
+
+
+def encoder_name() -> str:
+    return _pick_h264_encoder()[0]
+
+
+def hw_device_args() -> List[str]:
+    """Global options that must precede the inputs (empty for software)."""
+    return _device_args_for(encoder_name())
+
+
+def hw_upload_filter() -> str:
+    """Filter to append after the last video filter, or "" when not needed."""
+    return _upload_filter_for(encoder_name())
+
+
+def sw_pix_fmt() -> str:
+    """Software pixel format filters should end in before encode or upload.
+
+    Hardware encoders take NV12 natively; producing it directly skips a
+    yuv420p -> nv12 conversion of every frame.
+    """
+    return "yuv420p" if encoder_name() == "libx264" else "nv12"
+
+
+def with_hw_upload(vf: str) -> str:
+    up = hw_upload_filter()
+    return "%s,%s" % (vf, up) if up else vf
+
+
+def filter_threads() -> int:
+    return max(1, os.cpu_count() or 1)
+
+
+def filter_thread_args() -> List[str]:
+    """Global options sizing the filtergraph thread pools."""
+    n = str(filter_threads())
+    return ["-filter_threads", n, "-filter_complex_threads", n]
+
+
+def video_encoder_args(crf: str = "", threads: int = 0, sliced: bool = False) -> List[str]:
+    """-c:v, encoder options, and output pixel format for the chosen encoder.
+
+    crf, threads and sliced only apply to libx264; hardware encoders carry
+    their own quality setting and do not use CPU threads. threads=0 leaves
+    the default. sliced switches x264 to slice threading with -threads 0, so
+    frames come back without frame-thread latency when the filtergraph,
+    not the encoder, is the bottleneck.
+    """
+    name, opts = _pick_h264_encoder()
+    args = ["-c:v", name] + list(opts)
+    if name == "libx264" and crf:
+        args += ["-crf", crf]
+    if name == "libx264" and threads > 0:
+        args += ["-threads", str(int(threads))]
+    if name == "libx264" and sliced:
+        extra = "sliced-threads=1:rc-lookahead=10"
+        if "-x264-params" in args:
+            i = args.index("-x264-params") + 1
+            args[i] = "%s:%s" % (args[i], extra)
+        else:
+            args += ["-x264-params", extra]
+        if threads <= 0:
+            args += ["-threads", "0"]
+    if not hw_upload_filter():
+        # Uploaded frames already carry their hardware surface format.
+        args += ["-pix_fmt", sw_pix_fmt()]
+    return args
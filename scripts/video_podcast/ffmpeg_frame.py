@@ -0,0 +1,45 @@
+# ASCII-only. No ellipses. Keep <= 500 lines.
+"""Frame overlay PNG scaled to the output height once, outside the filtergraph."""
+import hashlib
+import os
+import struct
+import tempfile
+from pathlib import Path
+
+from .util import run
+
+FRAME_CACHE_DIR = Path(tempfile.gettempdir()) / "frame_cache"
+
+
+def _png_height(p: Path) -> int:
+    # IHDR is always the first chunk: signature(8) len(4) type(4) w(4) h(4).
+    with open(p, "rb") as f:
+        head = f.read(24)
+    if len(head) < 24 or head[:8] != b"\x89PNG\r\n\x1a\n" or head[12:16] != b"IHDR":
+        return 0
+    return int(struct.unpack(">I", head[20:24])[0])
+
+
+def prepared_frame(frame_png: Path, out_h: int) -> Path:
+    """Return a copy of frame_png scaled to out_h (aspect kept), cached by content.
+
+    The overlay then needs no scale2ref, which rescales the frame per frame.
+    """
+    if _png_height(frame_png) == int(out_h):
+        return frame_png
+    digest = hashlib.sha1(frame_png.read_bytes()).hexdigest()
+    dst = FRAME_CACHE_DIR / ("%s_h%d.png" % (digest, int(out_h)))
+    if dst.exists():
+        return dst
+    FRAME_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    part = dst.with_name("%s.%d.part.png" % (dst.stem, os.getpid()))
+    run([
+        "ffmpeg", "-y", "-v", "error",
+        "-i", str(frame_png),
+        "-vf", "scale=-1:%d,format=rgba" % int(out_h),
+        "-frames:v", "1",
+        str(part),
+    ], timeout_sec=120)
+    os.replace(part, dst)
+    print("[frame] prescaled src=%s dst=%s h=%d" % (frame_png.name, dst.name, int(out_h)), flush=True)
+    return dst
@@ -0,0 +1,81 @@
+# ASCII-only. No ellipses. Keep <= 500 lines.
+"""Static loudness normalization: one ebur128 scan, then volume + alimiter.
+
+ebur128 runs far faster than loudnorm, and the gain it yields is applied as a
+plain filter in whichever encode consumes the audio.
+"""
+import math
+import re
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from .util import run
+
+TARGET_I = -16.0
+TARGET_TP = -1.5
+# Used when the scan fails, so audio is never left unnormalized.
+LOUDNORM_FALLBACK = "loudnorm=I=-16:TP=-1.5:LRA=11"
+
+_I_RE = re.compile(r"^\s*I:\s*(-?[0-9.]+|-inf)\s*LUFS", re.M)
+_PEAK_RE = re.compile(r"^\s*Peak:\s*(-?[0-9.]+|-inf)\s*dBFS", re.M)
+
+# (resolved path, mtime_ns, size) -> (integrated LUFS, true peak dBFS)
+_SCAN_CACHE: Dict[Tuple[str, int, int], Tuple[float, float]] = {}
+
+
+def _last_float(rx: "re.Pattern[str]", text: str) -> Optional[float]:
+    m = rx.findall(text)
+    if not m:
+        return None
+    return float("-inf") if m[-1] == "-inf" else float(m[-1])
+
+
+def scan_loudness(src: Path) -> Tuple[float, float]:
+    """Return (integrated loudness LUFS, true peak dBFS) for src's audio."""
+    st = src.stat()
+    key = (str(src.resolve()), st.st_mtime_ns, st.st_size)
+    hit = _SCAN_CACHE.get(key)
+    if hit is not None:
+        return hit
+    cmd = [
+        "ffmpeg", "-hide_banner", "-nostats",
+        "-i", str(src),
+        "-vn",
+        "-af", "ebur128=peak=true",
+        "-f", "null", "-",
+    ]
+    err = run(cmd, timeout_sec=1800).stderr or ""
+    # The summary comes last; per-frame lines never carry "LUFS" after "I:".
+    i_lufs = _last_float(_I_RE, err)
+    peak = _last_float(_PEAK_RE, err)
+    if i_lufs is None or peak is None:
+        raise RuntimeError("ebur128 summary not found for %s" % str(src))
+    _SCAN_CACHE[key] = (i_lufs, peak)
+    return i_lufs, peak
+
+
+def gain_db_for(i_lufs: float, peak_dbfs: float) -> float:
+    if not math.isfinite(i_lufs):
+        return 0.0  # silence
+    gain = TARGET_I - i_lufs
+    if math.isfinite(peak_dbfs) and peak_dbfs + gain > TARGET_TP:
+        gain = TARGET_TP - peak_dbfs
+    return gain
+
+
+def loudness_filter(src: Path) -> str:
+    """Audio filter bringing src to TARGET_I, or loudnorm if the scan fails.
+
+    The alimiter ceiling is TARGET_TP as linear amplitude, a safety net for
+    sample peaks the gain clamp did not see.
+    """
+    try:
+        i_lufs, peak = scan_loudness(src)
+    except Exception as e:
+        print("[loudness][warn] scan_failed using_loudnorm err=%s" % e, flush=True)
+        return LOUDNORM_FALLBACK
+    gain = gain_db_for(i_lufs, peak)
+    print("[loudness] file=%s I=%.1f peak=%.1f gain_db=%.2f" % (src.name, i_lufs, peak, gain), flush=True)
+    # level=disabled: alimiter otherwise rescales output to the limit.
+    limit = 10 ** (TARGET_TP / 20.0)
+    return "volume=%.2fdB,alimiter=limit=%.4f:level=disabled" % (gain, limit)
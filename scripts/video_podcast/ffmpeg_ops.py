@@ -2,10 +2,22 @@
 import os
 
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
-
-from .util import ffprobe_duration_sec, run
-from .ffmpeg_progress import run_ffmpeg_with_progress
+from typing import Dict, List, Tuple
+
+from .util import ffprobe_duration_cached, ffprobe_durations, run
+from .ffmpeg_encoder import (
+    encoder_name,
+    filter_thread_args,
+    filter_threads,
+    hw_device_args,
+    hw_upload_filter,
+    sw_pix_fmt,
+    video_encoder_args,
+    with_hw_upload,
+)
+from .ffmpeg_frame import prepared_frame
+from .ffmpeg_loudness import loudness_filter
+from .ffmpeg_progress import build_segment_plan, run_ffmpeg_with_progress
 
 TARGET_W = 1920
 TARGET_H = 1080
@@ -17,14 +29,14 @@ def _verify_output_media(p: Path, min_bytes: int = 1024, min_dur_sec: float = 0.
     if p.stat().st_size < min_bytes:
         raise RuntimeError("ffmpeg output too small: %s" % str(p))
     try:
-        d = ffprobe_duration_sec(p)
+        d = ffprobe_duration_cached(p)
     except Exception as e:
         raise RuntimeError("ffmpeg output is not probeable: %s" % str(p)) from e
     print("[verify] file=%s dur_sec=%.3f bytes=%d" % (p.name, d, p.stat().st_size))
     if d < min_dur_sec:
         raise RuntimeError("ffmpeg output duration too short: %s" % str(p))
 
-def ffmpeg_make_clip(src: Path, dst: Path, start_sec: float, dur_sec: float) -> None:
+def ffmpeg_make_clip(src: Path, dst: Path, start_sec: float, dur_sec: float, threads: int = 0) -> None:
     dst.parent.mkdir(parents=True, exist_ok=True)
     vf = (
         "scale=%d:%d:force_original_aspect_ratio=decrease,"
@@ -32,18 +44,19 @@ def ffmpeg_make_clip(src: Path, dst: Path, start_sec: float, dur_sec: float) ->
         "fps=%d" % (TARGET_W, TARGET_H, TARGET_W, TARGET_H, TARGET_FPS)
     )
     cmd = [
-        "ffmpeg", "-y",
+        "ffmpeg", "-y", *hw_device_args(),
         "-ss", "%.3f" % start_sec,
         "-t", "%.3f" % dur_sec,
         "-i", str(src),
-        "-vf", vf,
+        "-vf", with_hw_upload(vf),
         "-an",
-        "-c:v", "libx264",
-        "-preset", "veryfast",
-        "-crf", os.getenv("VIDEO_CRF", "26"),
+        *video_encoder_args(crf=os.getenv("VIDEO_CRF", "26"), threads=threads),
         "-maxrate", os.getenv("VIDEO_MAXRATE", "4M"),
         "-bufsize", os.getenv("VIDEO_BUFSIZE", "8M"),
-        "-pix_fmt", "yuv420p",
+        # Fixed GOP so clips can be joined by stream copy.
+        "-g", str(2 * TARGET_FPS),
+        "-keyint_min", str(2 * TARGET_FPS),
+        "-sc_threshold", "0",
         str(dst),
     ]
     # Stream output to avoid "looks stuck" runs on Actions.
@@ -62,13 +75,11 @@ def ffmpeg_normalize_video(src: Path, dst: Path) -> None:
         "fps=%d" % (TARGET_W, TARGET_H, TARGET_W, TARGET_H, TARGET_FPS)
     )
     cmd = [
-        "ffmpeg", "-y",
+        "ffmpeg", "-y", *hw_device_args(),
         "-i", str(src),
-        "-vf", vf,
+        "-vf", with_hw_upload(vf),
         "-an",
-        "-c:v", "libx264",
-        "-preset", "veryfast",
-        "-pix_fmt", "yuv420p",
+        *video_encoder_args(),
         str(dst),
     ]
     run(cmd, timeout_sec=3600, stream=True)
@@ -77,14 +88,14 @@ def ffmpeg_normalize_video(src: Path, dst: Path) -> None:
 def ffmpeg_normalize_audio(src: Path, dst: Path) -> None:
     """Normalize podcast audio for consistent loudness.
 
-    Single-pass loudnorm is used for speed and predictable runtime.
+    An ebur128 scan picks a static gain, applied with volume + alimiter.
     """
     dst.parent.mkdir(parents=True, exist_ok=True)
     cmd = [
         "ffmpeg", "-y",
         "-i", str(src),
         "-vn",
-        "-af", "loudnorm=I=-16:TP=-1.5:LRA=11",
+        "-af", loudness_filter(src),
         "-ar", "44100",
         "-ac", "2",
         "-c:a", "aac",
@@ -106,10 +117,9 @@ def ffmpeg_concat_and_encode(clips: List[Path], dst: Path) -> None:
         "-f", "concat",
         "-safe", "0",
         "-i", str(lst),
-        "-c:v", "libx264",
-        "-preset", "veryfast",
-        "-pix_fmt", "yuv420p",
-        "-r", str(TARGET_FPS),
+        # Clips from ffmpeg_make_clip share geometry, fps and GOP layout, so a remux is enough.
+        "-c", "copy",
+        "-movflags", "+faststart",
         str(dst),
     ]
     run(cmd, timeout_sec=3600, stream=True)
@@ -145,16 +155,15 @@ def ffmpeg_concat_with_audio(clips: List[Path], audio: Path, dst: Path) -> None:
         lines.append("file '%s'" % c.as_posix())
     lst.write_text("\n".join(lines) + "\n", encoding="utf-8")
     cmd = [
-        "ffmpeg", "-y",
+        "ffmpeg", "-y", *hw_device_args(),
         "-f", "concat",
         "-safe", "0",
         "-i", str(lst),
         "-i", str(audio),
         "-map", "0:v:0",
         "-map", "1:a:0",
-        "-c:v", "libx264",
-        "-preset", "veryfast",
-        "-pix_fmt", "yuv420p",
+        *(["-vf", hw_upload_filter()] if hw_upload_filter() else []),
+        *video_encoder_args(),
         "-r", str(TARGET_FPS),
         "-c:a", "aac",
         "-b:a", "192k",
@@ -213,16 +222,12 @@ def ffmpeg_concat_with_intro_outro_and_frame(
         "fps=%d" % (TARGET_W, TARGET_H, TARGET_W, TARGET_H, TARGET_FPS)
     )
 
-    intro_dur = ffprobe_duration_sec(intro_outro_mp4)
+    intro_dur = ffprobe_duration_cached(intro_outro_mp4)
     if intro_dur <= 0.01:
         raise ValueError("intro/outro duration is invalid")
 
-    main_dur = 0.0
-    for c in clips:
-        try:
-            main_dur += ffprobe_duration_sec(c)
-        except Exception:
-            pass
+    # Unprobeable clips count as 0 s, as before.
+    main_dur = sum(ffprobe_durations(clips))
     if main_dur <= 0.01:
         raise ValueError("main duration is invalid")
 
@@ -240,30 +245,27 @@ def ffmpeg_concat_with_intro_outro_and_frame(
         "[o0]%s[outrov];"
         "[1:v]%s[main_pre];"
         "[3:v]format=rgba[frame];"
-        "[frame][main_pre]scale2ref=w=-1:h=main_h[frame_m][main_ref];"
-        "[main_ref][frame_m]overlay=x=(main_w-overlay_w)/2:y=(main_h-overlay_h)/2:shortest=1,format=yuv420p[mainv];"
+        "[main_pre][frame]overlay=x=(main_w-overlay_w)/2:y=(main_h-overlay_h)/2:shortest=1,format=%s[mainv];"
         "anullsrc=r=44100:cl=stereo,atrim=0:%s,asetpts=N/SR/TB[introa];"
         "[2:a]aformat=sample_fmts=fltp:sample_rates=44100:channel_layouts=stereo,"
         "apad,atrim=0:%s,asetpts=N/SR/TB[maina];"
         "anullsrc=r=44100:cl=stereo,atrim=0:%s,asetpts=N/SR/TB[outroa];"
-        "[introv][introa][mainv][maina][outrov][outroa]concat=n=3:v=1:a=1[v][a]"
-    ) % (vf_base, vf_base, vf_base, intro_dur_s, main_dur_s, intro_dur_s)
+        "[introv][introa][mainv][maina][outrov][outroa]concat=n=3:v=1:a=1[v0][a];[v0]%s[v]"
+    ) % (vf_base, vf_base, vf_base, sw_pix_fmt(), intro_dur_s, main_dur_s, intro_dur_s, hw_upload_filter() or "null")
 
     cmd = [
-        "ffmpeg", "-y",
+        "ffmpeg", "-y", *hw_device_args(),
         "-i", str(intro_outro_mp4),
         "-f", "concat",
         "-safe", "0",
         "-i", str(lst),
         "-i", str(podcast_audio),
         "-loop", "1",
-        "-i", str(frame_png),
+        "-i", str(prepared_frame(frame_png, TARGET_H)),
         "-filter_complex", filt,
         "-map", "[v]",
         "-map", "[a]",
-        "-c:v", "libx264",
-        "-preset", "veryfast",
-        "-pix_fmt", "yuv420p",
+        *video_encoder_args(),
         "-r", str(TARGET_FPS),
         "-c:a", "aac",
         "-b:a", "192k",
@@ -273,7 +275,8 @@ def ffmpeg_concat_with_intro_outro_and_frame(
         cmd.insert(-1, "+faststart")
         cmd.insert(-1, "-movflags")
     try:
-        run_ffmpeg_with_progress(cmd=cmd, segment_plan=segment_plan, expected_total_sec=expected_total, target_fps=TARGET_FPS, timeout_sec=7200)
+        expected_total = 2.0 * float(intro_dur) + float(main_dur)
+        run_ffmpeg_with_progress(cmd=cmd, segment_plan=[], expected_total_sec=expected_total, target_fps=TARGET_FPS, timeout_sec=7200)
         _verify_output_media(dst, min_bytes=500 * 1024, min_dur_sec=5.0)
     finally:
         try:
@@ -316,7 +319,7 @@ def ffmpeg_render_one_pass_with_intro_outro_and_frame(
 
     # Keep the existing video normalization targets.
     # One-pass concat requires every segment to have matching geometry, fps, and pixel format.
-    # Per-clip mode already outputs yuv420p, so we enforce the same here to avoid concat failures.
+    # Segments end in the encoder pixel format (yuv420p, or nv12 for hardware encoders) so concat sees one format.
     # NOTE: Some providers ship MP4s with pathological sample-aspect-ratio (SAR) metadata.
     # The concat filter requires matching SAR across all inputs, so force SAR to 1:1
     # after scaling/padding (this does not change pixel dimensions; it only normalizes metadata).
@@ -325,7 +328,7 @@ def ffmpeg_render_one_pass_with_intro_outro_and_frame(
         "pad=%d:%d:(ow-iw)/2:(oh-ih)/2,"
         "setsar=1,"
         "fps=%d,"
-        "format=yuv420p" % (TARGET_W, TARGET_H, TARGET_W, TARGET_H, TARGET_FPS)
+        "format=%s" % (TARGET_W, TARGET_H, TARGET_W, TARGET_H, TARGET_FPS, sw_pix_fmt())
     )
 
     intro_dur_s = "%.3f" % float(intro_silence_sec)
@@ -334,85 +337,21 @@ def ffmpeg_render_one_pass_with_intro_outro_and_frame(
     expected_total = float(intro_silence_sec) + float(main_dur_sec) + float(outro_silence_sec)
     expected_total_s = "%.3f" % float(expected_total)
 
-    # Build a segment plan for clear logs and runaway duration guards.
-    segment_plan: List[Dict[str, Any]] = []
-    abs_t = 0.0
-    segment_plan.append({
-        "kind": "intro",
-        "abs_start": abs_t,
-        "abs_end": abs_t + float(intro_silence_sec),
-        "dur": float(intro_silence_sec),
-    })
-    abs_t += float(intro_silence_sec)
-    repeats: Dict[str, List[int]] = {}
-    for i, seg in enumerate(segments):
-        p = str(seg.get("path") or "")
-        base = Path(p).name
-        st = float(seg.get("start_sec") or 0.0)
-        du = float(seg.get("dur_sec") or 0.0)
-        segment_plan.append({
-            "kind": "clip",
-            "idx": int(i),
-            "file": base,
-            "src_start": float(st),
-            "src_dur": float(du),
-            "abs_start": abs_t,
-            "abs_end": abs_t + float(du),
-            "dur": float(du),
-        })
-        abs_t += float(du)
-        repeats.setdefault(base, []).append(int(i))
-    segment_plan.append({
-        "kind": "outro",
-        "abs_start": abs_t,
-        "abs_end": abs_t + float(outro_silence_sec),
-        "dur": float(outro_silence_sec),
-    })
-    abs_t += float(outro_silence_sec)
-    # Structured plan logs.
-    print("[plan] intro_sec=%.3f main_sec=%.3f outro_sec=%.3f expected_total_sec=%.3f" % (
-        float(intro_silence_sec), float(main_dur_sec), float(outro_silence_sec), float(expected_total)
-    ), flush=True)
-    for s in segment_plan:
-        kind = str(s.get("kind") or "")
-        if kind == "clip":
-            print("[plan][seg] kind=clip idx=%s file=%s src_start=%.3f src_dur=%.3f abs_start=%.3f abs_end=%.3f" % (
-                str(s.get("idx")),
-                str(s.get("file")),
-                float(s.get("src_start") or 0.0),
-                float(s.get("src_dur") or 0.0),
-                float(s.get("abs_start") or 0.0),
-                float(s.get("abs_end") or 0.0),
-            ), flush=True)
-        else:
-            print("[plan][seg] kind=%s abs_start=%.3f abs_end=%.3f dur=%.3f" % (
-                kind,
-                float(s.get("abs_start") or 0.0),
-                float(s.get("abs_end") or 0.0),
-                float(s.get("dur") or 0.0),
-            ), flush=True)
-    for base, idxs in repeats.items():
-        if len(idxs) > 1:
-            print("[plan][repeat] file=%s count=%d idxs=%s" % (
-                base, int(len(idxs)), ",".join([str(x) for x in idxs])
-            ), flush=True)
-    # Guard: planned timeline must match expected_total within 1 frame.
-    tol = (1.0 / float(max(1, int(TARGET_FPS)))) + 0.05
-    if abs(abs_t - float(expected_total)) > tol:
-        print("[plan][warn] planned_total_mismatch planned=%.3f expected=%.3f tol=%.3f" % (
-            float(abs_t), float(expected_total), float(tol)
-        ), flush=True)
+    segment_plan = build_segment_plan(
+        segments, float(intro_silence_sec), float(outro_silence_sec),
+        float(main_dur_sec), float(expected_total), TARGET_FPS,
+    )
     # Inputs:
     # 0: intro/outro mp4 (video)
     # 1: podcast audio (original)
     # 2: frame png (looped)
     # 3..: raw source clips
     cmd: List[str] = [
-        "ffmpeg", "-y",
+        "ffmpeg", "-y", *hw_device_args(), *filter_thread_args(),
         "-i", str(intro_outro_mp4),
         "-i", str(podcast_audio),
         "-loop", "1",
-        "-i", str(frame_png),
+        "-i", str(prepared_frame(frame_png, TARGET_H)),
     ]
     for seg in segments:
         p = str(seg.get("path") or "")
@@ -439,15 +378,12 @@ def ffmpeg_render_one_pass_with_intro_outro_and_frame(
     # Concat main video from all segments.
     concat_main = "%sconcat=n=%d:v=1:a=0[main_pre]" % ("".join(v_labels), len(segments))
 
-    # Apply existing frame overlay sizing logic.
-    print(
-        "[overlay] frame_png=%s logic=scale2ref(h=main_h,w=-1)+center overlay (preserve AR, align by height)"
-        % frame_png.name
-    )
+    # Frame PNG is prescaled to the output height once, so the overlay is static.
+    print("[overlay] frame_png=%s logic=prescaled(h=%d)+center overlay (preserve AR)" % (frame_png.name, TARGET_H))
     overlay = (
         "[2:v]format=rgba[frame];"
-        "[frame][main_pre]scale2ref=w=-1:h=main_h[frame_m][main_ref];"
-        "[main_ref][frame_m]overlay=x=(main_w-overlay_w)/2:y=(main_h-overlay_h)/2:shortest=1,format=yuv420p[mainv]"
+        "[main_pre][frame]overlay=x=(main_w-overlay_w)/2:y=(main_h-overlay_h)/2:shortest=1,format=%s[mainv]"
+        % sw_pix_fmt()
     )
 
     # Intro/outro video from the same asset, trimmed by duration and normalized.
@@ -458,12 +394,13 @@ def ffmpeg_render_one_pass_with_intro_outro_and_frame(
     )
 
     # Audio: silence intro/outro, original audio for main (trimmed), all concatenated.
-    # Keep loudnorm settings consistent with the earlier approach, but apply in the final pass.
+    # Same -16 LUFS / -1.5 dBTP target as before, as a static gain from an ebur128 pre-scan.
     audio = (
         "anullsrc=r=44100:cl=stereo,atrim=0:%s,asetpts=N/SR/TB[introa];"
         "[1:a]aformat=sample_fmts=fltp:sample_rates=44100:channel_layouts=stereo,"
-        "loudnorm=I=-16:TP=-1.5:LRA=11,atrim=0:%s,asetpts=N/SR/TB[maina];"
-        "anullsrc=r=44100:cl=stereo,atrim=0:%s,asetpts=N/SR/TB[outroa]" % (intro_dur_s, main_dur_s, outro_dur_s)
+        "%s,atrim=0:%s,asetpts=N/SR/TB[maina];"
+        "anullsrc=r=44100:cl=stereo,atrim=0:%s,asetpts=N/SR/TB[outroa]"
+        % (intro_dur_s, loudness_filter(podcast_audio), main_dur_s, outro_dur_s)
     )
 
     # Final concat of (intro, main, outro) for both video and audio.
@@ -471,8 +408,9 @@ def ffmpeg_render_one_pass_with_intro_outro_and_frame(
     # This prevents cumulative frame rounding (e.g., fps normalization) from extending duration.
     tail = (
         "[introv][introa][mainv][maina][outrov][outroa]concat=n=3:v=1:a=1[v0][a0];"
-        "[v0]trim=duration=%s,setpts=PTS-STARTPTS[v];"
-        "[a0]atrim=duration=%s,asetpts=PTS-STARTPTS[a]" % (expected_total_s, expected_total_s)
+        "[v0]trim=duration=%s,setpts=PTS-STARTPTS%s[v];"
+        "[a0]atrim=duration=%s,asetpts=PTS-STARTPTS[a]"
+        % (expected_total_s, "," + hw_upload_filter() if hw_upload_filter() else "", expected_total_s)
     )
 
     filt = ";".join(v_parts + [concat_main, overlay, intro_outro, audio, tail])
@@ -481,9 +419,7 @@ def ffmpeg_render_one_pass_with_intro_outro_and_frame(
         "-filter_complex", filt,
         "-map", "[v]",
         "-map", "[a]",
-        "-c:v", "libx264",
-        "-preset", "veryfast",
-        "-pix_fmt", "yuv420p",
+        *video_encoder_args(sliced=True),
         "-r", str(TARGET_FPS),
         "-c:a", "aac",
         "-b:a", "192k",
@@ -494,6 +430,9 @@ def ffmpeg_render_one_pass_with_intro_outro_and_frame(
         cmd.insert(-1, "-movflags")
 
     # Print the final ffmpeg command before running so failures still show the exact invocation.
+    print("[ffmpeg][one_pass] encoder=%s filter_threads=%d x264_threads=%s" % (
+        encoder_name(), filter_threads(), "0(sliced)" if encoder_name() == "libx264" else "n/a"
+    ), flush=True)
     print("[ffmpeg][one_pass] %s" % " ".join([str(x) for x in cmd]), flush=True)
     run_ffmpeg_with_progress(cmd=cmd, segment_plan=segment_plan, expected_total_sec=expected_total, target_fps=TARGET_FPS, timeout_sec=7200)
     _verify_output_media(dst, min_bytes=500 * 1024, min_dur_sec=5.0)
@@ -2,13 +2,18 @@
 
 from __future__ import annotations
 
-import select
+import os
+import selectors
 import subprocess
 import threading
 import time
 from collections import deque
+from pathlib import Path
 from typing import Any, Deque, Dict, List, Optional, Tuple
 
+# Progress bytes read per wakeup; one read drains every block ffmpeg has queued.
+_READ_CHUNK = 65536
+
 
 def run_ffmpeg_with_progress(
     cmd: List[str],
@@ -120,11 +125,19 @@ def run_ffmpeg_with_progress(
             return
 
     th = None
+    sel = selectors.DefaultSelector()
     try:
         th = threading.Thread(target=_stderr_reader)
         th.start()
 
         assert p.stdout is not None
+        # stdout is read from the raw fd and split here: lines parked in the
+        # TextIOWrapper buffer would not wake the selector again.
+        out_fd = p.stdout.fileno()
+        sel.register(out_fd, selectors.EVENT_READ)
+        pending: Deque[str] = deque()
+        partial = ""
+        out_eof = False
         progress_kv: Dict[str, str] = {}
         last_print_sec = -1.0
         progress_events = 0
@@ -137,8 +150,21 @@ def run_ffmpeg_with_progress(
                     pass
                 raise RuntimeError("ffmpeg timeout exceeded")
 
-            # Use select() so we can emit heartbeat logs even if ffmpeg is not producing output.
-            rlist, _, _ = select.select([p.stdout], [], [], 1.0)
+            # Wait at most 1s so heartbeats are emitted even if ffmpeg is silent.
+            events = []
+            if not pending and not out_eof:
+                events = sel.select(timeout=1.0)
+                if events:
+                    chunk = os.read(out_fd, _READ_CHUNK)
+                    if chunk:
+                        lines = (partial + chunk.decode("utf-8", "replace")).split("\n")
+                        partial = lines.pop()
+                        pending.extend(lines)
+                    else:
+                        out_eof = True
+                        if partial:
+                            pending.append(partial)
+                            partial = ""
             now = time.time()
 
             # Always emit a wall-clock heartbeat, even if ffmpeg is chatty but not advancing time.
@@ -176,17 +202,12 @@ def run_ffmpeg_with_progress(
                 except Exception:
                     pass
                 raise RuntimeError("ffmpeg stalled: out_time not advancing")
-            if not rlist:
-                if p.poll() is not None:
+            if not pending:
+                if out_eof or (not events and p.poll() is not None):
                     break
                 continue
 
-            line = p.stdout.readline()
-            if line == "" and p.poll() is not None:
-                break
-            if not line:
-                continue
-            line = line.strip()
+            line = pending.popleft().strip()
             if "=" in line:
                 k, v = line.split("=", 1)
                 progress_kv[k.strip()] = v.strip()
@@ -266,9 +287,10 @@ def run_ffmpeg_with_progress(
 
         rc = p.wait()
         if rc != 0:
-            tail = "\n".join(stderr_tail[-50:])
+            tail = "\n".join(list(stderr_tail)[-50:])
             raise RuntimeError("ffmpeg failed rc=%d tail=%s" % (int(rc), tail))
     finally:
+        sel.close()
         try:
             if p.poll() is None:
                 p.terminate()
@@ -286,3 +308,81 @@ def run_ffmpeg_with_progress(
         except Exception:
             pass
 
+
+def build_segment_plan(
+    segments: List[Dict[str, Any]],
+    intro_silence_sec: float,
+    outro_silence_sec: float,
+    main_dur_sec: float,
+    expected_total: float,
+    target_fps: int,
+) -> List[Dict[str, Any]]:
+    """Build and log the intro/clip/outro plan used by run_ffmpeg_with_progress."""
+    segment_plan: List[Dict[str, Any]] = []
+    abs_t = 0.0
+    segment_plan.append({
+        "kind": "intro",
+        "abs_start": abs_t,
+        "abs_end": abs_t + float(intro_silence_sec),
+        "dur": float(intro_silence_sec),
+    })
+    abs_t += float(intro_silence_sec)
+    repeats: Dict[str, List[int]] = {}
+    for i, seg in enumerate(segments):
+        p = str(seg.get("path") or "")
+        base = Path(p).name
+        st = float(seg.get("start_sec") or 0.0)
+        du = float(seg.get("dur_sec") or 0.0)
+        segment_plan.append({
+            "kind": "clip",
+            "idx": int(i),
+            "file": base,
+            "src_start": float(st),
+            "src_dur": float(du),
+            "abs_start": abs_t,
+            "abs_end": abs_t + float(du),
+            "dur": float(du),
+        })
+        abs_t += float(du)
+        repeats.setdefault(base, []).append(int(i))
+    segment_plan.append({
+        "kind": "outro",
+        "abs_start": abs_t,
+        "abs_end": abs_t + float(outro_silence_sec),
+        "dur": float(outro_silence_sec),
+    })
+    abs_t += float(outro_silence_sec)
+    # Structured plan logs.
+    print("[plan] intro_sec=%.3f main_sec=%.3f outro_sec=%.3f expected_total_sec=%.3f" % (
+        float(intro_silence_sec), float(main_dur_sec), float(outro_silence_sec), float(expected_total)
+    ), flush=True)
+    for s in segment_plan:
+        kind = str(s.get("kind") or "")
+        if kind == "clip":
+            print("[plan][seg] kind=clip idx=%s file=%s src_start=%.3f src_dur=%.3f abs_start=%.3f abs_end=%.3f" % (
+                str(s.get("idx")),
+                str(s.get("file")),
+                float(s.get("src_start") or 0.0),
+                float(s.get("src_dur") or 0.0),
+                float(s.get("abs_start") or 0.0),
+                float(s.get("abs_end") or 0.0),
+            ), flush=True)
+        else:
+            print("[plan][seg] kind=%s abs_start=%.3f abs_end=%.3f dur=%.3f" % (
+                kind,
+                float(s.get("abs_start") or 0.0),
+                float(s.get("abs_end") or 0.0),
+                float(s.get("dur") or 0.0),
+            ), flush=True)
+    for base, idxs in repeats.items():
+        if len(idxs) > 1:
+            print("[plan][repeat] file=%s count=%d idxs=%s" % (
+                base, int(len(idxs)), ",".join([str(x) for x in idxs])
+            ), flush=True)
+    # Guard: planned timeline must match expected_total within 1 frame.
+    tol = (1.0 / float(max(1, int(target_fps)))) + 0.05
+    if abs(abs_t - float(expected_total)) > tol:
+        print("[plan][warn] planned_total_mismatch planned=%.3f expected=%.3f tol=%.3f" % (
+            float(abs_t), float(expected_total), float(tol)
+        ), flush=True)
+    return segment_plan
@@ -6,16 +6,12 @@ import shutil
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
-from .ffmpeg_ops import (
-    ffmpeg_concat_with_intro_outro_and_frame,
-    ffmpeg_make_clip,
-    ffmpeg_normalize_video,
-    ffmpeg_render_one_pass_with_intro_outro_and_frame,
-)
+from .ffmpeg_ops import ffmpeg_render_one_pass_with_intro_outro_and_frame
 from .model import Episode
 from .releases import download_clips_for_guid
 from .sources import apply_sensitive_query_policy, build_tiered_queries, search_assets, search_assets_page
 from .util import (
+    ffprobe_duration_cached,
     ffprobe_duration_sec,
     ffprobe_video_dims,
     now_iso,
@@ -92,10 +88,13 @@ def render_episode(
     # stable. This value is used as the location_prefix for query generation.
     search_prefix = str(os.environ.get("VP_SEARCH_PREFIX", "")).strip()
 
-    one_pass = bool(render_one_pass)
-    one_pass_env = os.environ.get("RENDER_ONE_PASS", "").strip().lower()
-    if one_pass_env in ("1", "true", "yes", "on"):
-        one_pass = True
+    # Clips are trimmed inside the single final encode; the per-clip
+    # encode + concat path is gone, so one-pass is always used. The flag and
+    # env (RENDER_ONE_PASS or VIDEO_ONE_PASS) are only logged.
+    one_pass = True
+    one_pass_env = (
+        os.environ.get("VIDEO_ONE_PASS", "") or os.environ.get("RENDER_ONE_PASS", "")
+    ).strip().lower()
 
     print("[episode] guid=%s title=%s" % (ep.guid, ep.title))
     print("[mode] one_pass=%s (flag=%s env=%s)" % (
@@ -127,175 +126,167 @@ def render_episode(
     trimmed = None
     raw_dir = None
 
-    if one_pass:
-        # One-pass mode uses raw sources and a single final encode.
-        out_clips_dir.mkdir(parents=True, exist_ok=True)
-
-        tiered_orig = build_tiered_queries(ep.title, ep.description, max_q=12, location_prefix=search_prefix)
-        q_orig = [str(x.get("query") or "") for x in tiered_orig]
-        q_filtered, query_policy = apply_sensitive_query_policy(ep.title, ep.description, q_orig, max_q=12)
-
-        # Re-apply tiers after filtering, keeping Tier-1 phrases first.
-        tiered_final: List[Dict[str, Any]] = []
-        for item in tiered_orig:
-            q = str(item.get("query") or "")
-            if q in q_filtered:
-                tiered_final.append({"tier": int(item.get("tier") or 3), "query": q})
-        # Add any proxy queries as Tier-3.
-        for q in q_filtered:
-            if not any(str(it.get("query") or "") == q for it in tiered_final):
-                tiered_final.append({"tier": 3, "query": q})
-
-        assets = search_assets(pexels_key, pixabay_key, tiered_final)
-        if not assets:
-            raise RuntimeError("no candidate assets found")
-
-        raw_dir = work / "raw"
-        raw_dir.mkdir(parents=True, exist_ok=True)
-
-        intro_outro_mp4 = (repo_root / DEFAULT_INTRO_OUTRO_MP4).resolve()
-        intro_silence = ffprobe_duration_sec(intro_outro_mp4)
-        print("[intro_outro] file=%s dur_sec=%.3f" % (str(intro_outro_mp4), intro_silence))
-        outro_silence = float(intro_silence)
-        total_audio = float(intro_silence) + float(audio_dur) + float(outro_silence)
-        print(
-            "[durations] T_audio=%.3f T_intro_silence=%.3f T_outro_silence=%.3f T_total=%.3f"
-            % (float(audio_dur), float(intro_silence), float(outro_silence), float(total_audio))
-        )
-        print("[intro_outro] file=%s dur_sec=%.3f" % (intro_outro_mp4.name, float(intro_silence)))
-
-        picks = [a for a in assets if int(a.get("tier") or 3) == 1]
-        if not picks:
-            raise RuntimeError("no Tier-1 assets found")
-        rng.shuffle(picks)
-
-        # Step 2) Clip acquisition (Tier-1 only, horizontal only).
-        attempts = 0
-        max_attempts = max(1, len(picks)) * 5
-        clip_i = 1
-        d_sum = 0.0
-        while d_sum < audio_dur and attempts < max_attempts:
-            a = picks[attempts % len(picks)]
-            attempts += 1
-            asset_key = "%s-%s" % (a["source"], a["asset_id"])
-            src_path = raw_dir / ("%s.mp4" % asset_key)
-            try:
-                if not src_path.exists():
-                    download(a["download_url"], src_path)
-                w, h = ffprobe_video_dims(src_path)
-                if w and h and w < h:
-                    print("[clip][reject] vertical asset=%s w=%d h=%d" % (asset_key, int(w), int(h)))
-                    try:
-                        src_path.unlink(missing_ok=True)
-                    except Exception:
-                        pass
-                    continue
-                file_dur = ffprobe_duration_sec(src_path)
-                if file_dur < MIN_ASSET_SEC:
-                    continue
-                start = 0.0
-                use_dur = float(file_dur)
-                clip_name = "raw_%04d.mp4" % clip_i
-                print("[clip] %s file_dur=%.3f use_start=0.000 use_dur=%.3f tier=1" % (clip_name, float(file_dur), float(use_dur)))
-                duration_log.append({
-                    "clip_index": clip_i,
-                    "clip_name": clip_name,
-                    "path": str(src_path),
-                    "file_duration_sec": round(float(file_dur), 3),
-                    "start_sec": 0.0,
-                    "planned_duration_sec": round(float(use_dur), 3),
-                    "tier": 1,
-                    "query": a.get("query") or "",
-                })
-                segments.append({"path": str(src_path), "start_sec": 0.0, "dur_sec": float(use_dur)})
-                prov.append({
-                    "clip_index": clip_i,
-                    "clip_name": clip_name,
-                    "tier": 1,
-                    "mode": "full",
-                    "source": a["source"],
-                    "asset_id": a["asset_id"],
-                    "author": a.get("author") or "",
-                    "page_url": a.get("page_url") or "",
-                    "download_url": a.get("download_url") or "",
-                    "license_url": a.get("license_url") or "",
-                    "query": a.get("query") or "",
-                    "start_sec": 0.0,
-                    "duration_sec": round(float(use_dur), 3),
-                    "file_duration_sec": round(float(file_dur), 3),
-                })
-                d_sum += float(use_dur)
-                clip_i += 1
-            except Exception:
+    # Raw (path, start, dur) segments go straight into the final encode.
+    out_clips_dir.mkdir(parents=True, exist_ok=True)
+
+    tiered_orig = build_tiered_queries(ep.title, ep.description, max_q=12, location_prefix=search_prefix)
+    q_orig = [str(x.get("query") or "") for x in tiered_orig]
+    q_filtered, query_policy = apply_sensitive_query_policy(ep.title, ep.description, q_orig, max_q=12)
+
+    # Re-apply tiers after filtering, keeping Tier-1 phrases first.
+    tiered_final: List[Dict[str, Any]] = []
+    for item in tiered_orig:
+        q = str(item.get("query") or "")
+        if q in q_filtered:
+            tiered_final.append({"tier": int(item.get("tier") or 3), "query": q})
+    # Add any proxy queries as Tier-3.
+    for q in q_filtered:
+        if not any(str(it.get("query") or "") == q for it in tiered_final):
+            tiered_final.append({"tier": 3, "query": q})
+
+    assets = search_assets(pexels_key, pixabay_key, tiered_final)
+    if not assets:
+        raise RuntimeError("no candidate assets found")
+
+    raw_dir = work / "raw"
+    raw_dir.mkdir(parents=True, exist_ok=True)
+
+    intro_outro_mp4 = (repo_root / DEFAULT_INTRO_OUTRO_MP4).resolve()
+    intro_silence = ffprobe_duration_cached(intro_outro_mp4)
+    print("[intro_outro] file=%s dur_sec=%.3f" % (str(intro_outro_mp4), intro_silence))
+    outro_silence = float(intro_silence)
+    total_audio = float(intro_silence) + float(audio_dur) + float(outro_silence)
+    print(
+        "[durations] T_audio=%.3f T_intro_silence=%.3f T_outro_silence=%.3f T_total=%.3f"
+        % (float(audio_dur), float(intro_silence), float(outro_silence), float(total_audio))
+    )
+    print("[intro_outro] file=%s dur_sec=%.3f" % (intro_outro_mp4.name, float(intro_silence)))
+
+    picks = [a for a in assets if int(a.get("tier") or 3) == 1]
+    if not picks:
+        raise RuntimeError("no Tier-1 assets found")
+    rng.shuffle(picks)
+
+    # Step 2) Clip acquisition (Tier-1 only, horizontal only).
+    attempts = 0
+    max_attempts = max(1, len(picks)) * 5
+    clip_i = 1
+    d_sum = 0.0
+    while d_sum < audio_dur and attempts < max_attempts:
+        a = picks[attempts % len(picks)]
+        attempts += 1
+        asset_key = "%s-%s" % (a["source"], a["asset_id"])
+        src_path = raw_dir / ("%s.mp4" % asset_key)
+        try:
+            if not src_path.exists():
+                download(a["download_url"], src_path)
+            w, h = ffprobe_video_dims(src_path)
+            if w and h and w < h:
+                print("[clip][reject] vertical asset=%s w=%d h=%d" % (asset_key, int(w), int(h)))
+                try:
+                    src_path.unlink(missing_ok=True)
+                except Exception:
+                    pass
+                continue
+            file_dur = ffprobe_duration_sec(src_path)
+            if file_dur < MIN_ASSET_SEC:
                 continue
+            start = 0.0
+            use_dur = float(file_dur)
+            clip_name = "raw_%04d.mp4" % clip_i
+            print("[clip] %s file_dur=%.3f use_start=0.000 use_dur=%.3f tier=1" % (clip_name, float(file_dur), float(use_dur)))
+            duration_log.append({
+                "clip_index": clip_i,
+                "clip_name": clip_name,
+                "path": str(src_path),
+                "file_duration_sec": round(float(file_dur), 3),
+                "start_sec": 0.0,
+                "planned_duration_sec": round(float(use_dur), 3),
+                "tier": 1,
+                "query": a.get("query") or "",
+            })
+            segments.append({"path": str(src_path), "start_sec": 0.0, "dur_sec": float(use_dur)})
+            prov.append({
+                "clip_index": clip_i,
+                "clip_name": clip_name,
+                "tier": 1,
+                "mode": "full",
+                "source": a["source"],
+                "asset_id": a["asset_id"],
+                "author": a.get("author") or "",
+                "page_url": a.get("page_url") or "",
+                "download_url": a.get("download_url") or "",
+                "license_url": a.get("license_url") or "",
+                "query": a.get("query") or "",
+                "start_sec": 0.0,
+                "duration_sec": round(float(use_dur), 3),
+                "file_duration_sec": round(float(file_dur), 3),
+            })
+            d_sum += float(use_dur)
+            clip_i += 1
+        except Exception:
+            continue
+
+    if d_sum < audio_dur and segments:
+        rep_i = 0
+        print("[clip][repeat] need_more_sec=%.3f" % (float(audio_dur) - float(d_sum)))
+        while d_sum < audio_dur:
+            base_seg = segments[rep_i % len(segments)]
+            base_prov = prov[rep_i % len(prov)]
+            clip_name = "raw_%04d.mp4" % clip_i
+            print("[clip][repeat] %s from=%s" % (clip_name, str(base_prov.get("clip_name") or "")))
+            duration_log.append({
+                "clip_index": clip_i,
+                "clip_name": clip_name,
+                "path": str(base_seg.get("path") or ""),
+                "file_duration_sec": round(float(base_prov.get("file_duration_sec") or 0.0), 3),
+                "start_sec": round(float(base_seg.get("start_sec") or 0.0), 3),
+                "planned_duration_sec": round(float(base_seg.get("dur_sec") or 0.0), 3),
+                "tier": 1,
+                "query": str(base_prov.get("query") or ""),
+                "repeat_of": str(base_prov.get("clip_name") or ""),
+            })
+            segments.append({
+                "path": str(base_seg.get("path") or ""),
+                "start_sec": float(base_seg.get("start_sec") or 0.0),
+                "dur_sec": float(base_seg.get("dur_sec") or 0.0),
+            })
+            prov.append({
+                **base_prov,
+                "clip_index": clip_i,
+                "clip_name": clip_name,
+                "mode": "repeat",
+            })
+            d_sum += float(base_seg.get("dur_sec") or 0.0)
+            clip_i += 1
+            rep_i += 1
+
+    # Trim last clip as needed so sum(clip durations) == T_audio.
+    if segments:
+        excess = float(d_sum) - float(audio_dur)
+        if excess > 0.0005:
+            last = segments[-1]
+            new_d = float(last.get("dur_sec") or 0.0) - float(excess)
+            if new_d < 0.1:
+                raise RuntimeError("last clip too short after trim")
+            last["dur_sec"] = float(new_d)
+            trimmed = {
+                "clip_index": int(duration_log[-1].get("clip_index") or 0),
+                "clip_name": str(duration_log[-1].get("clip_name") or ""),
+                "trim_sec": round(float(excess), 3),
+                "new_duration_sec": round(float(new_d), 3),
+            }
+            d_sum = float(audio_dur)
+            print(
+                "[trim] clip=%s trim_sec=%.3f new_dur=%.3f"
+                % (trimmed["clip_name"], float(excess), float(new_d))
+            )
+
+    if not segments or abs(float(d_sum) - float(audio_dur)) > 0.01:
+        raise RuntimeError("failed to build segments matching audio duration")
 
-        if d_sum < audio_dur and segments:
-            rep_i = 0
-            print("[clip][repeat] need_more_sec=%.3f" % (float(audio_dur) - float(d_sum)))
-            while d_sum < audio_dur:
-                base_seg = segments[rep_i % len(segments)]
-                base_prov = prov[rep_i % len(prov)]
-                clip_name = "raw_%04d.mp4" % clip_i
-                print("[clip][repeat] %s from=%s" % (clip_name, str(base_prov.get("clip_name") or "")))
-                duration_log.append({
-                    "clip_index": clip_i,
-                    "clip_name": clip_name,
-                    "path": str(base_seg.get("path") or ""),
-                    "file_duration_sec": round(float(base_prov.get("file_duration_sec") or 0.0), 3),
-                    "start_sec": round(float(base_seg.get("start_sec") or 0.0), 3),
-                    "planned_duration_sec": round(float(base_seg.get("dur_sec") or 0.0), 3),
-                    "tier": 1,
-                    "query": str(base_prov.get("query") or ""),
-                    "repeat_of": str(base_prov.get("clip_name") or ""),
-                })
-                segments.append({
-                    "path": str(base_seg.get("path") or ""),
-                    "start_sec": float(base_seg.get("start_sec") or 0.0),
-                    "dur_sec": float(base_seg.get("dur_sec") or 0.0),
-                })
-                prov.append({
-                    **base_prov,
-                    "clip_index": clip_i,
-                    "clip_name": clip_name,
-                    "mode": "repeat",
-                })
-                d_sum += float(base_seg.get("dur_sec") or 0.0)
-                clip_i += 1
-                rep_i += 1
-
-        # Trim last clip as needed so sum(clip durations) == T_audio.
-        if segments:
-            excess = float(d_sum) - float(audio_dur)
-            if excess > 0.0005:
-                last = segments[-1]
-                new_d = float(last.get("dur_sec") or 0.0) - float(excess)
-                if new_d < 0.1:
-                    raise RuntimeError("last clip too short after trim")
-                last["dur_sec"] = float(new_d)
-                trimmed = {
-                    "clip_index": int(duration_log[-1].get("clip_index") or 0),
-                    "clip_name": str(duration_log[-1].get("clip_name") or ""),
-                    "trim_sec": round(float(excess), 3),
-                    "new_duration_sec": round(float(new_d), 3),
-                }
-                d_sum = float(audio_dur)
-                print(
-                    "[trim] clip=%s trim_sec=%.3f new_dur=%.3f"
-                    % (trimmed["clip_name"], float(excess), float(new_d))
-                )
-
-        if not segments or abs(float(d_sum) - float(audio_dur)) > 0.01:
-            raise RuntimeError("failed to build segments matching audio duration")
-
-    else:
-        raise RuntimeError("render_one_pass is required (per-clip mode disabled)")
-
-    if one_pass:
-        if len(segments) < 1:
-            raise RuntimeError("no usable segments produced")
-    else:
-        if len(clips) < 1:
-            raise RuntimeError("no usable clips produced")
+    if len(segments) < 1:
+        raise RuntimeError("no usable segments produced")
 
     intro_outro_mp4 = (repo_root / DEFAULT_INTRO_OUTRO_MP4).resolve()
     frame_src_png = (repo_root / DEFAULT_FRAME_PNG).resolve()
@@ -313,42 +304,21 @@ def render_episode(
         print(f"[frame][warn] preprocessing_failed using_original err={e}")
 
     final_video = work / "video.mp4"
-    ffmpeg_cmd: List[str] = []
-    expected_total = 0.0
-    if one_pass:
-        intro_silence = ffprobe_duration_sec(intro_outro_mp4)
-        outro_silence = float(intro_silence)
-        ffmpeg_cmd, expected_total = ffmpeg_render_one_pass_with_intro_outro_and_frame(
-            segments=[{
-                "path": str(s["path"]),
-                "start_sec": float(s["start_sec"]),
-                "dur_sec": float(s["dur_sec"]),
-            } for s in segments],
-            podcast_audio=audio_path,
-            intro_outro_mp4=intro_outro_mp4,
-            frame_png=frame_png,
-            dst=final_video,
-            main_dur_sec=float(audio_dur),
-            intro_silence_sec=float(intro_silence),
-            outro_silence_sec=float(outro_silence),
-        )
-        print("[ffmpeg] %s" % " ".join([str(x) for x in ffmpeg_cmd]))
-    else:
-        out_clips_release_dir.mkdir(parents=True, exist_ok=True)
-        for c in clips:
-            name = c.name
-            rel_name = "%s_%s" % (ep.guid, name)
-            dst = out_clips_release_dir / rel_name
-            if not dst.exists():
-                shutil.copyfile(c, dst)
-
-        ffmpeg_concat_with_intro_outro_and_frame(
-            clips=clips,
-            podcast_audio=audio_path,
-            intro_outro_mp4=intro_outro_mp4,
-            frame_png=frame_png,
-            dst=final_video,
-        )
+    ffmpeg_cmd, expected_total = ffmpeg_render_one_pass_with_intro_outro_and_frame(
+        segments=[{
+            "path": str(s["path"]),
+            "start_sec": float(s["start_sec"]),
+            "dur_sec": float(s["dur_sec"]),
+        } for s in segments],
+        podcast_audio=audio_path,
+        intro_outro_mp4=intro_outro_mp4,
+        frame_png=frame_png,
+        dst=final_video,
+        main_dur_sec=float(audio_dur),
+        intro_silence_sec=float(intro_silence),
+        outro_silence_sec=float(outro_silence),
+    )
+    print("[ffmpeg] %s" % " ".join([str(x) for x in ffmpeg_cmd]))
 
     # Step 5) Verification gates.
     final_dur = ffprobe_duration_sec(final_video)
@@ -356,14 +326,13 @@ def render_episode(
     # quantization. In practice this can exceed 1 frame for long outputs.
     target_fps = 30.0
     tol = max(0.25, (2.0 / target_fps) + 0.05)
-    if one_pass:
-        if abs(float(final_dur) - float(expected_total)) > tol:
-            raise RuntimeError(
-                "final duration mismatch: got=%.3f expected=%.3f tol=%.3f"
-                % (float(final_dur), float(expected_total), float(tol))
-            )
-        if float(final_dur) > float(expected_total) + tol:
-            raise RuntimeError("final duration exceeds expected total")
+    if abs(float(final_dur) - float(expected_total)) > tol:
+        raise RuntimeError(
+            "final duration mismatch: got=%.3f expected=%.3f tol=%.3f"
+            % (float(final_dur), float(expected_total), float(tol))
+        )
+    if float(final_dur) > float(expected_total) + tol:
+        raise RuntimeError("final duration exceeds expected total")
 
     out_videos_dir.mkdir(parents=True, exist_ok=True)
     out_manifests_dir.mkdir(parents=True, exist_ok=True)
@@ -372,7 +341,7 @@ def render_episode(
     manifest_out = out_manifests_dir / manifest_asset
     shutil.copyfile(final_video, video_out)
 
-    intro_silence_sec = float(ffprobe_duration_sec(intro_outro_mp4))
+    intro_silence_sec = float(intro_silence)
 
     segments_timeline: list[dict] = []
     t_abs = intro_silence_sec
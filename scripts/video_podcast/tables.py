@@ -3,11 +3,12 @@
 from __future__ import annotations
 
 import csv
+import functools
 import json
 from dataclasses import dataclass
 from email.utils import parsedate_to_datetime
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, Iterator, List, Tuple
 
 from .model import Episode, parse_episodes
 from .repo_state import load_state
@@ -120,23 +121,33 @@ def ensure_podcasts_csv(repo_root: Path, default_podcast_id: str = "default") ->
     return p
 
 
-def load_podcasts(repo_root: Path) -> Dict[str, Dict[str, str]]:
-    ensure_podcasts_csv(repo_root)
-    _, rows = _read_csv(podcasts_csv_path(repo_root))
+def _stat_key(p: Path) -> Tuple[int, int]:
+    st = p.stat()
+    return st.st_mtime_ns, st.st_size
+
+
+@functools.lru_cache(maxsize=4)
+def _load_podcasts_cached(path: str, mtime_ns: int, size: int) -> Dict[str, Dict[str, str]]:
+    # Keyed on (path, mtime, size): any rewrite of the file is a new entry.
+    _, rows = _read_csv(Path(path))
     out: Dict[str, Dict[str, str]] = {}
     for r in rows:
         pid = (r.get("podcast_id") or "").strip()
         if not pid:
             continue
         out[pid] = {k: (r.get(k) or "").strip() for k in PODCASTS_FIELDS}
+    return out
+
+
+def load_podcasts(repo_root: Path) -> Dict[str, Dict[str, str]]:
+    ensure_podcasts_csv(repo_root)
+    p = podcasts_csv_path(repo_root)
+    out = _load_podcasts_cached(str(p), *_stat_key(p))
     if not out:
         ensure_podcasts_csv(repo_root)
-        _, rows2 = _read_csv(podcasts_csv_path(repo_root))
-        for r in rows2:
-            pid = (r.get("podcast_id") or "").strip()
-            if pid:
-                out[pid] = {k: (r.get(k) or "").strip() for k in PODCASTS_FIELDS}
-    return out
+        out = _load_podcasts_cached(str(p), *_stat_key(p))
+    # Callers get their own row dicts; the cached parse stays untouched.
+    return {pid: dict(row) for pid, row in out.items()}
 
 
 def pick_default_podcast_id(podcasts: Dict[str, Dict[str, str]]) -> str:
@@ -166,7 +177,12 @@ def ensure_queue_mode(repo_root: Path) -> Path:
 def load_queue_mode(repo_root: Path) -> QueueMode:
     ensure_queue_mode(repo_root)
     p = queue_mode_path(repo_root)
-    j = json.loads(p.read_text(encoding="utf-8"))
+    return _load_queue_mode_cached(str(p), *_stat_key(p))
+
+
+@functools.lru_cache(maxsize=4)
+def _load_queue_mode_cached(path: str, mtime_ns: int, size: int) -> QueueMode:
+    j = json.loads(Path(path).read_text(encoding="utf-8"))
     run_all = bool(j.get("run_all_podcasts", True))
     pid = str(j.get("podcast_id") or "").strip()
     updated = str(j.get("updated_at") or "").strip()
@@ -364,12 +380,25 @@ def _sort_videos(rows: List[Dict[str, str]]) -> List[Dict[str, str]]:
 def load_videos(repo_root: Path) -> List[Dict[str, str]]:
     ensure_videos_csv(repo_root)
     _, rows = _read_csv(videos_csv_path(repo_root))
-    out: List[Dict[str, str]] = []
-    for r in rows:
-        out.append({k: (r.get(k) or "").strip() for k in VIDEOS_FIELDS})
+    # _read_csv already stripped every cell; only fill in missing columns.
+    out = [{k: r.get(k, "") for k in VIDEOS_FIELDS} for r in rows]
     return _sort_videos(out)
 
 
+def iter_videos(repo_root: Path) -> Iterator[Dict[str, str]]:
+    """Yield videos.csv rows in file order without materializing the table.
+
+    ensure_videos_csv and write_videos always write the file sorted, so after
+    ensure_videos_csv the file order matches load_videos.
+    """
+    p = videos_csv_path(repo_root)
+    if not p.exists():
+        return
+    with p.open("r", encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f):
+            yield {k: (row.get(k) or "").strip() for k in VIDEOS_FIELDS}
+
+
 def write_videos(repo_root: Path, rows: List[Dict[str, str]]) -> None:
     fixed: List[Dict[str, str]] = []
     for r in rows:
@@ -1,6 +1,7 @@
 # ASCII-only. No ellipses. Keep <= 500 lines.
 
 import hashlib
+import http.client
 import json
 import random
 import re
@@ -10,11 +11,18 @@ import subprocess
 import threading
 import sys
 import time
+import urllib.parse
 import urllib.request
 from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any, Deque, Dict, List, Optional, Tuple
 
+try:
+    import orjson
+except ImportError:  # stdlib json fallback
+    orjson = None
+
 
 def ensure_png_canvas_16x9(
     *,
@@ -153,6 +161,35 @@ def ffprobe_duration_sec(p: Path) -> float:
     return float(out)
 
 
+# (resolved path, mtime_ns, size) -> duration. Each probe forks ffprobe, so
+# unchanged files are only probed once per process.
+_PROBE_CACHE: Dict[Tuple[str, int, int], float] = {}
+
+
+def ffprobe_duration_cached(p: Path) -> float:
+    st = p.stat()
+    key = (str(p.resolve()), st.st_mtime_ns, st.st_size)
+    d = _PROBE_CACHE.get(key)
+    if d is None:
+        d = ffprobe_duration_sec(p)
+        _PROBE_CACHE[key] = d
+    return d
+
+
+def ffprobe_durations(paths: List[Path], max_workers: int = 8) -> List[float]:
+    """Durations for paths in order, probed concurrently. 0.0 on failure."""
+    def one(p: Path) -> float:
+        try:
+            return ffprobe_duration_cached(p)
+        except Exception:
+            return 0.0
+
+    if len(paths) < 2:
+        return [one(p) for p in paths]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(paths))) as ex:
+        return list(ex.map(one, paths))
+
+
 def ffprobe_video_dims(p: Path) -> Tuple[int, int]:
     """Return (width, height) for the first video stream. (0,0) on failure."""
     try:
@@ -220,13 +257,95 @@ def http_get_json(url: str, headers: Dict[str, str], timeout_sec: int = 30) -> D
     return json.loads(raw)
 
 
-def download(url: str, dst: Path, timeout_sec: int = 90, headers: Dict[str, str] = None) -> None:
+class HttpPool:
+    """Per-thread keep-alive HTTP(S) connections for repeated downloads.
+
+    urllib.request opens a fresh connection (and TLS handshake) per call;
+    this keeps one http.client connection per (thread, scheme, host) and
+    follows redirects itself. It does not speak to proxies; download()
+    bypasses it when a proxy is configured.
+    """
+
+    MAX_REDIRECTS = 5
+
+    def __init__(self) -> None:
+        self._local = threading.local()
+
+    def _conn(self, scheme: str, netloc: str, timeout_sec: int) -> http.client.HTTPConnection:
+        conns = getattr(self._local, "conns", None)
+        if conns is None:
+            conns = self._local.conns = {}
+        c = conns.get((scheme, netloc))
+        if c is None:
+            cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+            c = cls(netloc, timeout=timeout_sec)
+            conns[(scheme, netloc)] = c
+        else:
+            # A reused connection keeps its socket; apply this call's timeout.
+            c.timeout = timeout_sec
+            if c.sock is not None:
+                c.sock.settimeout(timeout_sec)
+        return c
+
+    def _drop(self, scheme: str, netloc: str) -> None:
+        c = getattr(self._local, "conns", {}).pop((scheme, netloc), None)
+        if c is not None:
+            c.close()
+
+    def fetch_to(self, url: str, f, headers: Dict[str, str], timeout_sec: int) -> None:
+        for _ in range(self.MAX_REDIRECTS + 1):
+            u = urllib.parse.urlsplit(url)
+            path = u.path or "/"
+            if u.query:
+                path += "?" + u.query
+            for attempt in range(2):
+                c = self._conn(u.scheme, u.netloc, timeout_sec)
+                try:
+                    c.request("GET", path, headers=headers)
+                    resp = c.getresponse()
+                    break
+                except (OSError, http.client.HTTPException) as e:
+                    # Never keep a half-used connection pooled. Only a pooled
+                    # connection the server already closed is retried, once.
+                    self._drop(u.scheme, u.netloc)
+                    stale = isinstance(e, (ConnectionError, http.client.CannotSendRequest))
+                    if attempt or not stale:
+                        raise
+            try:
+                if resp.status in (301, 302, 303, 307, 308):
+                    resp.read()
+                    url = urllib.parse.urljoin(url, resp.getheader("Location") or "")
+                    continue
+                if resp.status >= 300:
+                    raise RuntimeError("download failed: HTTP %d %s" % (resp.status, url))
+                shutil.copyfileobj(resp, f, length=1024 * 1024)
+                if resp.will_close:
+                    self._drop(u.scheme, u.netloc)
+                return
+            except BaseException:
+                self._drop(u.scheme, u.netloc)
+                raise
+        raise RuntimeError("download failed: too many redirects %s" % url)
+
+
+def download(
+    url: str,
+    dst: Path,
+    timeout_sec: int = 90,
+    headers: Dict[str, str] = None,
+    pool: Optional[HttpPool] = None,
+) -> None:
     dst.parent.mkdir(parents=True, exist_ok=True)
     h = {"User-Agent": USER_AGENT}
     if headers:
         for k, v in headers.items():
             if k and v:
                 h[str(k)] = str(v)
+    # http.client ignores HTTP(S)_PROXY / NO_PROXY; urllib honours them.
+    if pool is not None and not urllib.request.getproxies():
+        with open(dst, "wb") as f:
+            pool.fetch_to(url, f, h, timeout_sec)
+        return
     req = urllib.request.Request(url, headers=h, method="GET")
     with urllib.request.urlopen(req, timeout=timeout_sec) as resp:
         with open(dst, "wb") as f:
@@ -234,11 +353,24 @@ def download(url: str, dst: Path, timeout_sec: int = 90, headers: Dict[str, str]
 
 
 def load_json(p: Path) -> Any:
+    if orjson is not None:
+        return orjson.loads(p.read_bytes())
     return json.loads(p.read_text(encoding="utf-8"))
 
 
 def save_json(p: Path, obj: Any) -> None:
     p.parent.mkdir(parents=True, exist_ok=True)
+    if orjson is not None:
+        # Same bytes as the json.dumps below as long as the output is ASCII
+        # (json.dumps escapes anything else), apart from exponent floats
+        # (1e-7 vs 1e-07), which parse back identically.
+        try:
+            data = orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS)
+        except TypeError:
+            data = b""
+        if data and data.isascii():
+            p.write_bytes(data)
+            return
     p.write_text(json.dumps(obj, indent=2, sort_keys=True), encoding="utf-8")
 
 